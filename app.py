@@ -14,22 +14,15 @@ from config.settings import APP_CONFIG, TOOLTIPS
 from modules.data_handler.file_uploader import FileUploader
 from modules.data_handler.data_validator import DataValidator
 from modules.data_handler.data_processor import DataProcessor
-from modules.analysis.weibull_analysis import WeibullAnalysis
-from modules.analysis.reliability_metrics import ReliabilityMetrics
-from modules.analysis.statistical_tests import StatisticalTests
-from utils.helpers import init_session_state, format_number
+from modules.ui.common import init_app_session_state
+from utils.helpers import format_number
 from utils.constants import TIME_UNITS
 
 # Configuração da página
 st.set_page_config(**APP_CONFIG)
 
 # Inicialização do session state
-init_session_state("data", None)
-init_session_state("filename", None)
-init_session_state("data_status", "not_loaded")
-init_session_state("validation_results", None)
-init_session_state("processed_data", None)
-init_session_state("analysis_results", None)
+init_app_session_state()
 
 # Título principal
 st.title("📊 Weibull Reliability Analyzer")
@@ -172,9 +165,27 @@ if st.session_state.get("processed_data") is not None:
             format="%.2f",
             help="Nível de confiança para intervalos"
         )
-    
+
+    # Ajuste por equipamento: só oferecido quando os dados têm a coluna
+    # de identificação com mais de um grupo
+    fit_per_group = False
+    if ("equipamento" in st.session_state["processed_data"].columns
+            and st.session_state["processed_data"]["equipamento"].nunique() > 1):
+        fit_per_group = st.checkbox(
+            "Ajustar por equipamento",
+            value=False,
+            help="Ajusta uma Weibull independente para cada equipamento "
+                 "(os ajustes rodam em paralelo)"
+        )
+
     if st.button("📈 Executar Análise de Weibull", type="primary"):
         with st.spinner("Executando análise de Weibull..."):
+            # Imports tardios: scipy só é carregado quando a análise roda
+            from modules.analysis.weibull_analysis import WeibullAnalysis
+            from modules.analysis.reliability_metrics import ReliabilityMetrics
+            from modules.analysis.statistical_tests import StatisticalTests
+            from modules.analysis.results import AnalysisResults
+
             # Análise de Weibull
             weibull = WeibullAnalysis(st.session_state["processed_data"])
             results = weibull.fit(method=method, confidence_level=confidence_level)
@@ -191,14 +202,14 @@ if st.session_state.get("processed_data") is not None:
             interpretation = weibull.get_interpretation()
             
             # Armazena resultados
-            st.session_state["analysis_results"] = {
-                "weibull": results,
-                "metrics": metrics,
-                "tests": test_results,
-                "interpretation": interpretation,
-                "weibull_obj": weibull,
-                "metrics_obj": metrics_calc
-            }
+            st.session_state["analysis_results"] = AnalysisResults(
+                weibull=results,
+                metrics=metrics,
+                tests=test_results,
+                interpretation=interpretation,
+                weibull_obj=weibull,
+                metrics_obj=metrics_calc,
+            )
             
             st.session_state["data_status"] = "analyzed"
             
@@ -312,23 +323,61 @@ if st.session_state.get("processed_data") is not None:
                 else:
                     st.warning("⚠️ " + ks_result['interpretation'])
 
+            # Ajuste por equipamento (opcional)
+            if fit_per_group:
+                import pandas as pd
+
+                st.markdown("---")
+                st.subheader("🏭 Ajuste por Equipamento")
+
+                by_group = WeibullAnalysis.fit_by_group(
+                    st.session_state["processed_data"], method=method
+                )
+                if by_group:
+                    st.dataframe(pd.DataFrame([
+                        {
+                            'Equipamento': name,
+                            'β': f"{a.results['beta']:.4f}",
+                            'η': f"{a.results['eta']:.2f}",
+                            'Falhas': len(a.failures),
+                            'MTTF': f"{a.mean_life():.2f}",
+                        }
+                        for name, a in by_group.items()
+                    ]), use_container_width=True)
+                else:
+                    st.info("ℹ️ Nenhum equipamento possui falhas suficientes "
+                            "para um ajuste individual.")
+
 # ETAPA 5: Visualizações
 if st.session_state.get("analysis_results") is not None:
     st.markdown("---")
     st.header("5️⃣ Visualizações")
     
     analysis_results = st.session_state["analysis_results"]
-    weibull_obj = analysis_results["weibull_obj"]
-    metrics_obj = analysis_results["metrics_obj"]
-    
+    weibull_obj = analysis_results.weibull_obj
+    metrics_obj = analysis_results.metrics_obj
+
     # Importa classes de visualização
     from modules.visualization.weibull_plots import WeibullPlots
     from modules.visualization.reliability_plots import ReliabilityPlots
-    
+    from utils.helpers import get_or_build
+
     # Cria objetos de visualização
     weibull_plots = WeibullPlots(weibull_obj, metrics_obj)
     reliability_plots = ReliabilityPlots(weibull_obj, metrics_obj)
-    
+
+    # Figuras são reaproveitadas entre reruns (cliques em tabs/widgets);
+    # invalida o cache quando os parâmetros do ajuste mudam
+    params_hash = hash((
+        analysis_results.weibull["beta"],
+        analysis_results.weibull["eta"],
+        analysis_results.weibull["confidence_level"],
+    ))
+    if st.session_state.get("figure_params_hash") != params_hash:
+        for fig_key in [k for k in st.session_state.keys() if k.startswith("fig_")]:
+            del st.session_state[fig_key]
+        st.session_state["figure_params_hash"] = params_hash
+
     # Tabs para diferentes visualizações
     tab1, tab2, tab3, tab4 = st.tabs([
         "📊 Gráficos Principais",
@@ -344,14 +393,14 @@ if st.session_state.get("analysis_results") is not None:
         
         with col1:
             st.plotly_chart(
-                weibull_plots.probability_plot(),
+                get_or_build("fig_probability", weibull_plots.probability_plot),
                 use_container_width=True,
                 key="prob_plot"
             )
         
         with col2:
             st.plotly_chart(
-                weibull_plots.reliability_vs_time(),
+                get_or_build("fig_reliability", weibull_plots.reliability_vs_time),
                 use_container_width=True,
                 key="reliability_plot"
             )
@@ -363,20 +412,20 @@ if st.session_state.get("analysis_results") is not None:
         
         with col1:
             st.plotly_chart(
-                weibull_plots.hazard_rate_plot(),
+                get_or_build("fig_hazard", weibull_plots.hazard_rate_plot),
                 use_container_width=True,
                 key="hazard_plot"
             )
         
         with col2:
             st.plotly_chart(
-                reliability_plots.failure_distribution_histogram(),
+                get_or_build("fig_histogram", reliability_plots.failure_distribution_histogram),
                 use_container_width=True,
                 key="histogram_plot"
             )
         
         st.plotly_chart(
-            weibull_plots.pdf_cdf_plot(),
+            get_or_build("fig_pdf_cdf", weibull_plots.pdf_cdf_plot),
             use_container_width=True,
             key="pdf_cdf_plot"
         )
@@ -388,14 +437,14 @@ if st.session_state.get("analysis_results") is not None:
         
         with col1:
             st.plotly_chart(
-                reliability_plots.b_life_chart(),
+                get_or_build("fig_b_life", reliability_plots.b_life_chart),
                 use_container_width=True,
                 key="blife_chart"
             )
         
         with col2:
             st.plotly_chart(
-                reliability_plots.metrics_comparison(),
+                get_or_build("fig_metrics", reliability_plots.metrics_comparison),
                 use_container_width=True,
                 key="metrics_comparison"
             )
@@ -403,7 +452,7 @@ if st.session_state.get("analysis_results") is not None:
     with tab4:
         st.subheader("Visão Geral Completa")
         st.plotly_chart(
-            weibull_plots.combined_analysis_plot(),
+            get_or_build("fig_combined", weibull_plots.combined_analysis_plot),
             use_container_width=True,
             key="combined_plot"
         )
@@ -416,9 +465,9 @@ if st.session_state.get("analysis_results") is not None:
         
         with col1:
             calc_time = st.number_input(
-                f"Tempo para análise ({analysis_results['weibull']['time_unit']})",
+                f"Tempo para análise ({analysis_results.weibull['time_unit']})",
                 min_value=0.0,
-                value=float(analysis_results['metrics']['median_life']),
+                value=float(analysis_results.metrics['median_life']),
                 step=10.0
             )
         
@@ -54,6 +54,10 @@ WEIBULL_CONFIG = {
     "min_samples": 3,
     "max_iterations": 1000,
     "tolerance": 1e-6,
+    # Ajuste de 2 parâmetros (β, η) com localização fixa em zero.
+    # O ajuste de 3 parâmetros é instável (localização espúria ≈ min(t))
+    # e muito mais lento; só deve ser habilitado com um método dedicado.
+    "fix_location": True,
 }
 
 # Mensagens de ajuda e tooltips
@@ -1,9 +1,23 @@
 """
 Módulo de análise estatística
 """
-from .weibull_analysis import WeibullAnalysis
-from .reliability_metrics import ReliabilityMetrics
-from .statistical_tests import StatisticalTests
+# Imports preguiçosos (PEP 562): evita carregar scipy e afins na
+# inicialização do app — os módulos só são importados no primeiro uso.
+_LAZY_IMPORTS = {
+    "WeibullAnalysis": ".weibull_analysis",
+    "ReliabilityMetrics": ".reliability_metrics",
+    "StatisticalTests": ".statistical_tests",
+    "AnalysisResults": ".results",
+}
 
-__all__ = ["WeibullAnalysis", "ReliabilityMetrics", "StatisticalTests"]
+__all__ = list(_LAZY_IMPORTS)
 
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        module = import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,41 @@
 """
 Módulo para cálculo de métricas de confiabilidade
 """
-import numpy as np
+import math
+
 from typing import Dict
 from scipy import stats
-from scipy.special import gamma  # CORREÇÃO: importar gamma
+from scipy.special import gammaln  # função gamma (log), não a distribuição
+import streamlit as st
+
+
+@st.cache_data(show_spinner=False)
+def _compute_all_metrics(beta: float, eta: float) -> Dict:
+    """
+    Calcula as métricas de confiabilidade em forma fechada
+
+    Função pura de (beta, eta), cacheada com st.cache_data: reruns do
+    Streamlit com o mesmo ajuste retornam o dicionário pronto.
+    """
+    mttf = eta * math.gamma(1 + 1 / beta)
+    # Forma via gammaln: estável para beta grande, onde gamma(1+2/beta)
+    # e gamma(1+1/beta)² são quase iguais
+    variance = eta ** 2 * (math.exp(gammaln(1 + 2 / beta))
+                           - math.exp(2 * gammaln(1 + 1 / beta)))
+    std_dev = math.sqrt(variance) if variance > 0 else 0.0
+
+    return {
+        "mttf": mttf,
+        "median_life": eta * math.log(2) ** (1 / beta),
+        "characteristic_life": eta,
+        "b10_life": eta * (-math.log(1 - 0.10)) ** (1 / beta),
+        "b50_life": eta * (-math.log(1 - 0.50)) ** (1 / beta),
+        "b90_life": eta * (-math.log(1 - 0.90)) ** (1 / beta),
+        "mode": eta * ((beta - 1) / beta) ** (1 / beta) if beta > 1 else 0.0,
+        "variance": variance,
+        "std_dev": std_dev,
+        "coefficient_of_variation": std_dev / mttf if mttf > 0 else 0.0,
+    }
 
 
 class ReliabilityMetrics:
@@ -23,52 +54,27 @@ class ReliabilityMetrics:
     def calculate_all_metrics(self) -> Dict:
         """
         Calcula todas as métricas de confiabilidade
-        
+
         Returns:
             Dicionário com todas as métricas
         """
-        metrics = {
-            "mttf": self.analysis.mean_life(),
-            "median_life": self.analysis.median_life(),
-            "characteristic_life": self.analysis.characteristic_life(),
-            "b10_life": self.analysis.b_life(10),
-            "b50_life": self.analysis.b_life(50),
-            "b90_life": self.analysis.b_life(90),
-            "mode": self._calculate_mode(),
-            "variance": self._calculate_variance(),
-            "std_dev": self._calculate_std_dev(),
-            "coefficient_of_variation": self._calculate_cv(),
-        }
-        
-        return metrics
-    
+        return _compute_all_metrics(self.results["beta"], self.results["eta"])
+
     def _calculate_mode(self) -> float:
         """Calcula a moda da distribuição"""
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        if beta > 1:
-            return eta * ((beta - 1) / beta) ** (1 / beta)
-        else:
-            return 0.0
-    
+        return self.calculate_all_metrics()["mode"]
+
     def _calculate_variance(self) -> float:
         """Calcula a variância"""
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        return eta**2 * (gamma(1 + 2/beta) - gamma(1 + 1/beta)**2)
-    
+        return self.calculate_all_metrics()["variance"]
+
     def _calculate_std_dev(self) -> float:
         """Calcula o desvio padrão"""
-        return np.sqrt(self._calculate_variance())
-    
+        return self.calculate_all_metrics()["std_dev"]
+
     def _calculate_cv(self) -> float:
         """Calcula o coeficiente de variação"""
-        mean = self.analysis.mean_life()
-        std = self._calculate_std_dev()
-        
-        return std / mean if mean > 0 else 0.0
+        return self.calculate_all_metrics()["coefficient_of_variation"]
     
     def reliability_at_time(self, t: float) -> Dict:
         """
@@ -80,12 +86,24 @@ class ReliabilityMetrics:
         Returns:
             Dicionário com métricas no tempo t
         """
+        beta = self.results["beta"]
+        eta = self.results["eta"]
+
+        # Fórmulas analíticas escalares — evita quatro avaliações
+        # vetorizadas separadas para um único ponto
+        R = math.exp(-((t / eta) ** beta))
+
+        if t > 0 or beta >= 1:
+            hazard = (beta / eta) * (t / eta) ** (beta - 1)
+        else:
+            hazard = float("inf")
+
         return {
             "time": t,
-            "reliability": self.analysis.reliability(np.array([t]))[0],
-            "unreliability": self.analysis.unreliability(np.array([t]))[0],
-            "pdf": self.analysis.pdf(np.array([t]))[0],
-            "hazard_rate": self.analysis.hazard_rate(np.array([t]))[0],
+            "reliability": R,
+            "unreliability": 1 - R,
+            "pdf": hazard * R,
+            "hazard_rate": hazard,
         }
     
     def mission_reliability(self, mission_time: float, 
@@ -100,14 +118,16 @@ class ReliabilityMetrics:
         Returns:
             Dicionário com análise da missão
         """
-        actual_reliability = self.analysis.reliability(np.array([mission_time]))[0]
+        beta = self.results["beta"]
+        eta = self.results["eta"]
+
+        # Avaliação escalar direta — sem embrulhar um único tempo em array
+        actual_reliability = math.exp(-((mission_time / eta) ** beta))
         meets_requirement = actual_reliability >= required_reliability
-        
+
         # Calcula tempo para atingir confiabilidade requerida
         if required_reliability < 1.0:
-            beta = self.results["beta"]
-            eta = self.results["eta"]
-            time_for_required = eta * (-np.log(required_reliability)) ** (1 / beta)
+            time_for_required = eta * (-math.log(required_reliability)) ** (1 / beta)
         else:
             time_for_required = 0.0
         
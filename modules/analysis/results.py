@@ -0,0 +1,22 @@
+"""
+Módulo com o contêiner de resultados da análise
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(slots=True)
+class AnalysisResults:
+    """
+    Contêiner dos resultados de uma análise completa
+
+    Substitui o dicionário aninhado no session state: acesso por
+    atributo em classe com slots é mais barato que lookups encadeados
+    de dict a cada rerun do Streamlit.
+    """
+    weibull: Dict
+    metrics: Dict
+    tests: Dict
+    interpretation: Dict
+    weibull_obj: object
+    metrics_obj: object
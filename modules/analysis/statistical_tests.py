@@ -1,138 +1,303 @@
 """
 Módulo para testes estatísticos
 """
+import math
+
 import numpy as np
 from scipy import stats
 from typing import Dict, Tuple
+import streamlit as st
+
+
+def _anderson_darling_test(beta: float, eta: float, failures: np.ndarray) -> Dict:
+    """Teste de Anderson-Darling para (beta, eta) e falhas dadas"""
+    # Fórmula direta de A² sobre os dados ordenados — uma única
+    # expressão NumPy, sem o caminho genérico do stats.anderson
+    n = len(failures)
+    # expm1 preserva precisão na cauda u→0: com 1-exp(...) um tempo de
+    # falha quase nulo colapsa u para 0 exato e log(u) vira -inf
+    u = -np.expm1(-(np.sort(failures) / eta) ** beta)
+
+    i = np.arange(1, n + 1)
+    a2 = -n - np.sum((2 * i - 1) * (np.log(u) + np.log1p(-u[::-1]))) / n
+
+    # Correção de Stephens (1974) para Weibull com parâmetros estimados,
+    # com valor crítico correspondente a 5% de significância
+    statistic = a2 * (1 + 0.2 / math.sqrt(n))
+    critical_value = 0.757
+
+    passed = statistic < critical_value
+
+    return {
+        "test_name": "Anderson-Darling",
+        "statistic": statistic,
+        "critical_value": critical_value,
+        "significance_level": 0.05,
+        "passed": passed,
+        "interpretation": "Dados seguem distribuição de Weibull" if passed
+                        else "Dados podem não seguir distribuição de Weibull"
+    }
+
+
+def _rank_regression_batch(samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Regressão de ranks vetorizada: um ajuste (beta, eta) por linha
+
+    Usa a forma fechada da inclinação/intercepto da regressão linear em
+    vez de um loop de np.polyfit por amostra.
+    """
+    n = samples.shape[1]
+
+    x = np.log(np.sort(samples, axis=1))
+    ranks = np.arange(1, n + 1)
+    y = np.log(-np.log(1 - (ranks - 0.3) / (n + 0.4)))
+
+    x_mean = x.mean(axis=1, keepdims=True)
+    x_centered = x - x_mean
+    beta = (x_centered @ (y - y.mean())) / np.einsum(
+        "ij,ij->i", x_centered, x_centered
+    )
+    intercept = y.mean() - beta * x_mean[:, 0]
+    eta = np.exp(-intercept / beta)
+
+    return beta, eta
+
+
+def _mle_batch(samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MLE vetorizado: um ajuste (beta, eta) por linha
+
+    Newton-Raphson na equação de score perfilada (a mesma de `_fit_mle`,
+    sem censura), com todas as linhas avançando em lockstep — as
+    reduções por iteração compartilham o mesmo vetor t^beta.
+    """
+    n = samples.shape[1]
+
+    logs = np.log(samples)
+    mean_log = logs.mean(axis=1)
+
+    # Início pela relação de Gumbel: std(log t) = pi/(beta*sqrt(6))
+    beta = 1.2825 / np.maximum(logs.std(axis=1), 1e-12)
+
+    with np.errstate(all='ignore'):
+        for _ in range(50):
+            tk = np.exp(beta[:, None] * logs)
+            s0 = tk.sum(axis=1)
+            s1 = np.einsum('ij,ij->i', tk, logs)
+            s2 = np.einsum('ij,ij,ij->i', tk, logs, logs)
+            g = 1.0 / beta + mean_log - s1 / s0
+            gp = -1.0 / beta ** 2 - (s2 * s0 - s1 * s1) / (s0 * s0)
+            step = g / gp
+            # Linhas que divergiram ficam paradas; as demais avançam
+            step = np.where(np.isfinite(step), step, 0.0)
+            beta = np.maximum(beta - step, 1e-6)
+            if np.abs(step).max() < 1e-10:
+                break
+
+        eta = (np.exp(beta[:, None] * logs).sum(axis=1) / n) ** (1.0 / beta)
+
+    return beta, eta
+
+
+def _ks_mc_pvalue(beta: float, eta: float, n: int, d_obs: float,
+                  method: str = "mle", n_samples: int = 500) -> float:
+    """
+    p-valor de Monte Carlo para o teste KS com parâmetros estimados
+
+    O p-valor assintótico do stats.kstest assume parâmetros conhecidos a
+    priori; com (beta, eta) estimados dos próprios dados ele sai
+    sistematicamente conservador (problema de Lilliefors). Aqui a
+    distribuição nula de D é construída empiricamente: amostras Weibull
+    sintéticas com os parâmetros ajustados, reajustadas pelo MESMO
+    estimador do ajuste observado (a distribuição nula de D depende do
+    estimador), estatística D por linha em uma passada.
+    """
+    rng = np.random.default_rng(0)
+    samples = eta * rng.weibull(beta, size=(n_samples, n))
+
+    if method == "mle":
+        beta_syn, eta_syn = _mle_batch(samples)
+    else:
+        beta_syn, eta_syn = _rank_regression_batch(samples)
+    sorted_syn = np.sort(samples, axis=1)
+    F = 1 - np.exp(-(sorted_syn / eta_syn[:, None]) ** beta_syn[:, None])
+
+    i = np.arange(1, n + 1)
+    d_syn = np.maximum((i / n - F).max(axis=1), (F - (i - 1) / n).max(axis=1))
+
+    return (1 + (d_syn >= d_obs).sum()) / (n_samples + 1)
+
+
+def _kolmogorov_smirnov_test(beta: float, eta: float, failures: np.ndarray,
+                             method: str = "mle") -> Dict:
+    """Teste de Kolmogorov-Smirnov para (beta, eta) e falhas dadas"""
+    # CDF teórica de Weibull
+    def weibull_cdf(x):
+        return 1 - np.exp(-(x / eta) ** beta)
+
+    # Estatística D observada
+    statistic, _ = stats.kstest(failures, weibull_cdf)
+
+    # p-valor por Monte Carlo: corrige o viés de parâmetros estimados,
+    # com as sintéticas reajustadas pelo mesmo método do ajuste
+    p_value = _ks_mc_pvalue(beta, eta, len(failures), statistic, method)
+
+    passed = p_value > 0.05
+
+    return {
+        "test_name": "Kolmogorov-Smirnov",
+        "statistic": statistic,
+        "p_value": p_value,
+        "significance_level": 0.05,
+        "passed": passed,
+        "interpretation": "Dados seguem distribuição de Weibull" if passed
+                        else "Dados podem não seguir distribuição de Weibull"
+    }
+
+
+def _coefficient_of_determination(beta: float, eta: float, failures: np.ndarray) -> Dict:
+    """R² do ajuste para (beta, eta) e falhas dadas"""
+    # Ordena falhas
+    sorted_failures = np.sort(failures)
+    n = len(sorted_failures)
+
+    # Valores observados (median ranks)
+    ranks = np.arange(1, n + 1)
+    observed = (ranks - 0.3) / (n + 0.4)
+
+    # Valores preditos pela Weibull
+    predicted = 1 - np.exp(-(sorted_failures / eta) ** beta)
+
+    # R² com reduções fundidas: produto escalar para SS_res e n·var
+    # para SS_tot, sem os arrays temporários de desvios ao quadrado
+    diff = observed - predicted
+    ss_res = diff @ diff
+    ss_tot = n * observed.var()
+    r_squared = 1 - (ss_res / ss_tot)
+
+    # Interpretação
+    if r_squared > 0.95:
+        quality = "Excelente"
+    elif r_squared > 0.90:
+        quality = "Bom"
+    elif r_squared > 0.80:
+        quality = "Aceitável"
+    else:
+        quality = "Pobre"
+
+    return {
+        "r_squared": r_squared,
+        "quality": quality,
+        "interpretation": f"Ajuste {quality.lower()} aos dados (R² = {r_squared:.4f})"
+    }
+
+
+def _log_likelihood(fit_stats) -> Dict:
+    """Log-verossimilhança, AIC e BIC a partir das estatísticas do ajuste"""
+    fs = fit_stats
+
+    ll = (fs.n_failures * math.log(fs.beta)
+          - fs.n_failures * fs.beta * math.log(fs.eta)
+          + (fs.beta - 1) * fs.sum_log_failures
+          - fs.sum_tk / fs.eta ** fs.beta)
+
+    # 2 parâmetros estimados (beta, eta)
+    aic = 2 * 2 - 2 * ll
+    bic = 2 * math.log(fs.n_total) - 2 * ll
+
+    return {
+        "log_likelihood": ll,
+        "aic": aic,
+        "bic": bic,
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _run_all_tests_cached(beta: float, eta: float, failures: np.ndarray,
+                          fit_stats, method: str = "mle") -> Dict:
+    """
+    Executa todos os testes para um ajuste
+
+    Cacheado em (beta, eta, dados, método): reruns do Streamlit com o
+    mesmo ajuste não recalculam os testes de adequação.
+    """
+    return {
+        "anderson_darling": _anderson_darling_test(beta, eta, failures),
+        "kolmogorov_smirnov": _kolmogorov_smirnov_test(beta, eta, failures,
+                                                       method),
+        "r_squared": _coefficient_of_determination(beta, eta, failures),
+        "log_likelihood": _log_likelihood(fit_stats)
+    }
 
 
 class StatisticalTests:
     """Classe para testes estatísticos de adequação"""
-    
+
     def __init__(self, weibull_analysis):
         """
         Inicializa com resultados da análise de Weibull
-        
+
         Args:
             weibull_analysis: Instância de WeibullAnalysis
         """
         self.analysis = weibull_analysis
         self.failures = weibull_analysis.failures
         self.results = weibull_analysis.results
-    
+
     def anderson_darling_test(self) -> Dict:
         """
         Teste de Anderson-Darling para adequação
-        
+
         Returns:
             Dicionário com resultados do teste
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        # Transforma dados para distribuição exponencial padrão
-        transformed = (self.failures / eta) ** beta
-        
-        # Aplica teste de Anderson-Darling
-        result = stats.anderson(transformed, dist='expon')
-        
-        # Interpreta resultado
-        critical_value = result.critical_values[2]  # 5% significance
-        statistic = result.statistic
-        
-        passed = statistic < critical_value
-        
-        return {
-            "test_name": "Anderson-Darling",
-            "statistic": statistic,
-            "critical_value": critical_value,
-            "significance_level": 0.05,
-            "passed": passed,
-            "interpretation": "Dados seguem distribuição de Weibull" if passed 
-                            else "Dados podem não seguir distribuição de Weibull"
-        }
-    
+        return _anderson_darling_test(self.results["beta"], self.results["eta"],
+                                      self.failures)
+
     def kolmogorov_smirnov_test(self) -> Dict:
         """
         Teste de Kolmogorov-Smirnov para adequação
-        
+
         Returns:
             Dicionário com resultados do teste
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        # CDF teórica de Weibull
-        def weibull_cdf(x):
-            return 1 - np.exp(-(x / eta) ** beta)
-        
-        # Aplica teste KS
-        statistic, p_value = stats.kstest(self.failures, weibull_cdf)
-        
-        passed = p_value > 0.05
-        
-        return {
-            "test_name": "Kolmogorov-Smirnov",
-            "statistic": statistic,
-            "p_value": p_value,
-            "significance_level": 0.05,
-            "passed": passed,
-            "interpretation": "Dados seguem distribuição de Weibull" if passed 
-                            else "Dados podem não seguir distribuição de Weibull"
-        }
-    
+        return _kolmogorov_smirnov_test(self.results["beta"], self.results["eta"],
+                                        self.failures,
+                                        self.results.get("method", "mle"))
+
     def coefficient_of_determination(self) -> Dict:
         """
         Calcula R² para avaliar qualidade do ajuste
-        
+
         Returns:
             Dicionário com R² e interpretação
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        # Ordena falhas
-        sorted_failures = np.sort(self.failures)
-        n = len(sorted_failures)
-        
-        # Valores observados (median ranks)
-        ranks = np.arange(1, n + 1)
-        observed = (ranks - 0.3) / (n + 0.4)
-        
-        # Valores preditos pela Weibull
-        predicted = 1 - np.exp(-(sorted_failures / eta) ** beta)
-        
-        # Calcula R²
-        ss_res = np.sum((observed - predicted) ** 2)
-        ss_tot = np.sum((observed - np.mean(observed)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot)
-        
-        # Interpretação
-        if r_squared > 0.95:
-            quality = "Excelente"
-        elif r_squared > 0.90:
-            quality = "Bom"
-        elif r_squared > 0.80:
-            quality = "Aceitável"
-        else:
-            quality = "Pobre"
-        
-        return {
-            "r_squared": r_squared,
-            "quality": quality,
-            "interpretation": f"Ajuste {quality.lower()} aos dados (R² = {r_squared:.4f})"
-        }
-    
+        return _coefficient_of_determination(self.results["beta"], self.results["eta"],
+                                             self.failures)
+
+    def log_likelihood(self) -> Dict:
+        """
+        Calcula log-verossimilhança e critérios de informação (AIC/BIC)
+
+        Reutiliza as estatísticas suficientes (Σlog t, Σt^β) guardadas
+        durante o ajuste — forma fechada, sem nova passada nos dados.
+
+        Returns:
+            Dicionário com log-verossimilhança, AIC e BIC
+        """
+        return _log_likelihood(self.analysis.fit_stats)
+
     def run_all_tests(self) -> Dict:
         """
         Executa todos os testes estatísticos
-        
+
         Returns:
             Dicionário com todos os resultados
         """
-        return {
-            "anderson_darling": self.anderson_darling_test(),
-            "kolmogorov_smirnov": self.kolmogorov_smirnov_test(),
-            "r_squared": self.coefficient_of_determination()
-        }
-
+        return _run_all_tests_cached(
+            self.results["beta"],
+            self.results["eta"],
+            np.asarray(self.failures),
+            self.analysis.fit_stats,
+            self.results.get("method", "mle"),
+        )
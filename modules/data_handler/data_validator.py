@@ -8,6 +8,14 @@ import streamlit as st
 
 from config.settings import REQUIRED_COLUMNS, VALIDATION_CONFIG
 from utils.constants import ERROR_MESSAGES, WARNING_MESSAGES, SUCCESS_MESSAGES
+from utils.helpers import normalize_column_name
+
+# Candidatos de nome de coluna normalizados uma única vez no import,
+# em vez de a cada validação
+_NORMALIZED_CANDIDATES = {
+    key: tuple(normalize_column_name(name) for name in names)
+    for key, names in REQUIRED_COLUMNS.items()
+}
 
 
 class DataValidator:
@@ -20,7 +28,11 @@ class DataValidator:
         Args:
             df: DataFrame a ser validado
         """
-        self.df = df.copy()
+        # Referência direta, sem deep copy: a validação nunca escreve no
+        # frame — as coerções numéricas vão para Series locais em
+        # _coerced, reutilizadas pelas checagens e estatísticas
+        self.df = df
+        self._coerced = {}
         self.validation_results = {
             "is_valid": False,
             "errors": [],
@@ -39,7 +51,18 @@ class DataValidator:
         # 1. Verifica se o DataFrame não está vazio
         if not self._check_not_empty():
             return self.validation_results
-        
+
+        # Rejeição rápida: com menos linhas que o mínimo de amostras o
+        # resultado já está decidido — nem coerção nem estatísticas
+        from config.settings import WEIBULL_CONFIG
+        min_samples = WEIBULL_CONFIG["min_samples"]
+        if len(self.df) < min_samples:
+            self.validation_results["errors"].append(
+                f"❌ Quantidade insuficiente de falhas. "
+                f"Mínimo necessário: {min_samples}. Encontrado: {len(self.df)}"
+            )
+            return self.validation_results
+
         # 2. Tenta mapear as colunas automaticamente
         self._map_columns()
         
@@ -73,25 +96,19 @@ class DataValidator:
     
     def _map_columns(self):
         """Tenta mapear automaticamente as colunas necessárias"""
-        from utils.helpers import find_column_match
-        
+        # Normaliza as colunas do DataFrame uma única vez e resolve os
+        # três mapeamentos contra os candidatos pré-normalizados
+        normalized_columns = {
+            normalize_column_name(col): col for col in self.df.columns
+        }
+
         mapping = {}
-        
-        # Tenta encontrar coluna de tempo
-        tempo_col = find_column_match(self.df, REQUIRED_COLUMNS["tempo_falha"])
-        if tempo_col:
-            mapping["tempo_falha"] = tempo_col
-        
-        # Tenta encontrar coluna de status/censura
-        status_col = find_column_match(self.df, REQUIRED_COLUMNS["status"])
-        if status_col:
-            mapping["status"] = status_col
-        
-        # Tenta encontrar coluna de identificação
-        id_col = find_column_match(self.df, REQUIRED_COLUMNS["equipamento"])
-        if id_col:
-            mapping["equipamento"] = id_col
-        
+        for key, candidates in _NORMALIZED_CANDIDATES.items():
+            for candidate in candidates:
+                if candidate in normalized_columns:
+                    mapping[key] = normalized_columns[candidate]
+                    break
+
         self.validation_results["column_mapping"] = mapping
     
     def _check_required_columns(self) -> bool:
@@ -121,11 +138,14 @@ class DataValidator:
         if "tempo_falha" in mapping:
             tempo_col = mapping["tempo_falha"]
             try:
-                # Tenta converter para numérico
-                self.df[tempo_col] = pd.to_numeric(self.df[tempo_col], errors='coerce')
-                
-                # Verifica se há valores não numéricos
-                null_count = self.df[tempo_col].isna().sum()
+                # Converte para numérico em uma Series local (o frame
+                # original permanece intocado)
+                tempo_num = pd.to_numeric(self.df[tempo_col], errors='coerce')
+                self._coerced["tempo_falha"] = tempo_num
+
+                # Verifica se há valores não numéricos — len - count()
+                # usa o contador de nulos em C, sem Series booleana
+                null_count = len(tempo_num) - tempo_num.count()
                 if null_count > 0:
                     self.validation_results["warnings"].append(
                         f"⚠️ {null_count} valores não numéricos encontrados na coluna de tempo. "
@@ -140,12 +160,26 @@ class DataValidator:
         if "status" in mapping:
             status_col = mapping["status"]
             try:
-                # Tenta converter para numérico
-                self.df[status_col] = pd.to_numeric(self.df[status_col], errors='coerce')
-                
-                # Verifica valores únicos
-                unique_values = self.df[status_col].dropna().unique()
-                if not all(v in [0, 1] for v in unique_values):
+                # Converte para numérico em uma Series local
+                status_num = pd.to_numeric(self.df[status_col], errors='coerce')
+                self._coerced["status"] = status_num
+
+                # Verifica valores únicos direto no array, sem o
+                # round-trip de dropna() por uma Series intermediária
+                status_arr = status_num.to_numpy(dtype=np.float64)
+                valid_arr = status_arr[~np.isnan(status_arr)]
+                unique_values = pd.unique(valid_arr)
+
+                # Visão int limpa (só valores em {0, 1} — um status
+                # arbitrário como 10**9 estouraria o bincount adiante),
+                # reutilizada pela contagem de falhas/censuras
+                ints = valid_arr.astype(np.int64)
+                safe = ((ints == 0) | (ints == 1)) & (ints == valid_arr)
+                self._coerced["status_int"] = ints[safe]
+
+                # np.isin testa todos os valores únicos de uma vez, sem
+                # o loop Python com `in` por elemento
+                if not np.isin(unique_values, (0.0, 1.0)).all():
                     self.validation_results["warnings"].append(
                         f"⚠️ Coluna de status contém valores diferentes de 0 e 1: {unique_values}. "
                         "Esperado: 0 (censurado) e 1 (falha)."
@@ -155,48 +189,71 @@ class DataValidator:
                     f"❌ Erro ao processar coluna de status: {str(e)}"
                 )
     
+    def _valid_times(self) -> np.ndarray:
+        """
+        Array float64 dos tempos válidos (sem NaN)
+
+        Uma única máscara/gather sobre a Series coagida, cacheado em
+        _coerced e compartilhado pelas checagens e estatísticas — sem o
+        rebuild de Index que um dropna() por chamada custaria.
+        """
+        arr = self._coerced.get("valid_times")
+        if arr is None:
+            tempo_num = self._coerced.get("tempo_falha")
+            if tempo_num is None:
+                mapping = self.validation_results["column_mapping"]
+                tempo_num = pd.to_numeric(self.df[mapping["tempo_falha"]],
+                                          errors='coerce')
+            arr = tempo_num.to_numpy(dtype=np.float64, copy=False)
+            arr = arr[~np.isnan(arr)]
+            self._coerced["valid_times"] = arr
+        return arr
+
     def _check_invalid_values(self):
         """Verifica valores inválidos nos dados"""
         mapping = self.validation_results["column_mapping"]
-        
+
         if "tempo_falha" in mapping:
-            tempo_col = mapping["tempo_falha"]
-            
-            # Remove valores nulos
-            valid_times = self.df[tempo_col].dropna()
-            
+            # Trabalha direto no array numpy compartilhado: máscaras
+            # vetorizadas + contagens via count_nonzero, sem Series
+            # booleanas intermediárias
+            arr = self._valid_times()
+
+            if arr.size == 0:
+                return
+
             # Verifica valores negativos
             if not VALIDATION_CONFIG["allow_negative_times"]:
-                negative_count = (valid_times < 0).sum()
+                negative_count = np.count_nonzero(arr < 0)
                 if negative_count > 0:
                     self.validation_results["errors"].append(
                         f"❌ {negative_count} valores negativos encontrados na coluna de tempo. "
                         "Tempos devem ser positivos."
                     )
-            
+
             # Verifica valores muito pequenos (próximos de zero)
-            near_zero_count = ((valid_times > 0) & (valid_times < 0.001)).sum()
+            near_zero_count = np.count_nonzero((arr > 0) & (arr < 0.001))
             if near_zero_count > 0:
                 self.validation_results["warnings"].append(
                     f"⚠️ {near_zero_count} valores muito próximos de zero encontrados. "
                     "Verifique se a unidade de tempo está correta."
                 )
-            
+
             # Verifica valores muito grandes
-            if valid_times.max() > VALIDATION_CONFIG["max_failure_time"]:
+            if arr.max() > VALIDATION_CONFIG["max_failure_time"]:
                 self.validation_results["warnings"].append(
                     "⚠️ Valores de tempo muito grandes detectados. "
                     "Verifique se a unidade de tempo está correta."
                 )
-            
-            # Verifica outliers usando IQR
-            Q1 = valid_times.quantile(0.25)
-            Q3 = valid_times.quantile(0.75)
+
+            # Verifica outliers usando IQR — os dois quantis saem de um
+            # único np.quantile (um sort em vez de dois)
+            Q1, Q3 = np.quantile(arr, [0.25, 0.75])
             IQR = Q3 - Q1
-            outliers = ((valid_times < (Q1 - 3 * IQR)) | (valid_times > (Q3 + 3 * IQR))).sum()
-            
+            outliers = np.count_nonzero((arr < (Q1 - 3 * IQR)) | (arr > (Q3 + 3 * IQR)))
+
             if outliers > 0:
-                outlier_pct = (outliers / len(valid_times)) * 100
+                outlier_pct = (outliers / arr.size) * 100
                 if outlier_pct > 5:
                     self.validation_results["warnings"].append(
                         f"⚠️ {outliers} possíveis outliers detectados ({outlier_pct:.1f}% dos dados). "
@@ -216,24 +273,41 @@ class DataValidator:
         }
         
         if "tempo_falha" in mapping:
-            tempo_col = mapping["tempo_falha"]
-            valid_data = self.df[tempo_col].dropna()
-            stats["valid_records"] = len(valid_data)
-            
-            if len(valid_data) > 0:
-                stats["min_time"] = float(valid_data.min())
-                stats["max_time"] = float(valid_data.max())
-                stats["mean_time"] = float(valid_data.mean())
-                stats["median_time"] = float(valid_data.median())
-                stats["std_time"] = float(valid_data.std())
+            # Estatísticas direto no ndarray compartilhado, sem o
+            # overhead de eixo rotulado das reduções de Series
+            arr = self._valid_times()
+            stats["valid_records"] = int(arr.size)
+
+            if arr.size > 0:
+                stats["min_time"] = float(arr.min())
+                stats["max_time"] = float(arr.max())
+                stats["mean_time"] = float(arr.mean())
+                stats["median_time"] = float(np.median(arr))
+                # ddof=1 reproduz o desvio amostral do pandas
+                stats["std_time"] = float(arr.std(ddof=1))
         
         if "status" in mapping:
-            status_col = mapping["status"]
-            valid_status = self.df[status_col].dropna()
-            
-            stats["failures"] = int((valid_status == 1).sum())
-            stats["censored"] = int((valid_status == 0).sum())
-            
+            valid_status = self._coerced.get("status")
+            if valid_status is None:
+                valid_status = pd.to_numeric(self.df[mapping["status"]],
+                                             errors='coerce')
+            valid_status = valid_status.dropna()
+
+            # Uma única passada com bincount no lugar dos dois scans
+            # (==1).sum() / (==0).sum(); valores fora de {0, 1} ficam
+            # de fora da contagem, como antes. A visão int limpa vem
+            # pronta de _validate_data_types quando disponível
+            ints = self._coerced.get("status_int")
+            if ints is None:
+                status_arr = valid_status.to_numpy(dtype=np.float64)
+                as_int = status_arr.astype(np.int64)
+                mask = ((as_int == 0) | (as_int == 1)) & (as_int == status_arr)
+                ints = as_int[mask]
+            counts = np.bincount(ints, minlength=2)
+
+            stats["failures"] = int(counts[1]) if counts.size > 1 else 0
+            stats["censored"] = int(counts[0])
+
             if len(valid_status) > 0:
                 stats["censoring_rate"] = (stats["censored"] / len(valid_status)) * 100
         else:
@@ -323,20 +397,20 @@ class DataValidator:
                     help="Registros censurados (sem falha observada)"
                 )
             
-            # Estatísticas de tempo
+            # Estatísticas de tempo — uma única tabela no lugar de
+            # quatro widgets st.metric (um elemento enviado ao browser
+            # em vez de quatro)
             if "mean_time" in stats:
                 st.markdown("#### Estatísticas de Tempo")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.metric("Mínimo", f"{stats['min_time']:.2f}")
-                with col2:
-                    st.metric("Média", f"{stats['mean_time']:.2f}")
-                with col3:
-                    st.metric("Mediana", f"{stats['median_time']:.2f}")
-                with col4:
-                    st.metric("Máximo", f"{stats['max_time']:.2f}")
+
+                time_stats = pd.DataFrame({
+                    "Mínimo": [f"{stats['min_time']:.2f}"],
+                    "Média": [f"{stats['mean_time']:.2f}"],
+                    "Mediana": [f"{stats['median_time']:.2f}"],
+                    "Máximo": [f"{stats['max_time']:.2f}"],
+                })
+                st.dataframe(time_stats, hide_index=True,
+                             use_container_width=True)
         
         return results["is_valid"]
 
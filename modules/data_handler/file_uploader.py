@@ -1,6 +1,9 @@
 """
 Módulo para upload e leitura de arquivos
 """
+import csv
+import zipfile
+
 import streamlit as st
 import pandas as pd
 import io
@@ -12,16 +15,268 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 try:
-    import PyPDF2
-    import pdfplumber
-    import tabula
+    import pyarrow as pa
+    _HAS_PYARROW = True
 except ImportError:
-    st.warning("⚠️ Algumas bibliotecas de PDF não estão disponíveis. A leitura de PDF pode não funcionar.")
+    _HAS_PYARROW = False
 
 from config.settings import SUPPORTED_FORMATS
 from utils.constants import ERROR_MESSAGES, SUCCESS_MESSAGES
 
 
+@st.cache_data(show_spinner=False)
+def _get_sheet_names(file_bytes: bytes, filename: str) -> list:
+    """
+    Retorna os nomes das planilhas de um arquivo Excel
+
+    Args:
+        file_bytes: Conteúdo do arquivo
+        filename: Nome do arquivo (parte da chave de cache)
+
+    Returns:
+        Lista com nomes das planilhas
+    """
+    try:
+        # calamine (Rust) é bem mais rápido que openpyxl quando instalado
+        excel_file = pd.ExcelFile(io.BytesIO(file_bytes), engine='calamine')
+    except (ImportError, ValueError):
+        excel_file = pd.ExcelFile(io.BytesIO(file_bytes))
+    return excel_file.sheet_names
+
+
+@st.cache_data(show_spinner=False)
+def _count_sheets(file_bytes: bytes, filename: str) -> int:
+    """
+    Conta as planilhas de um arquivo Excel
+
+    Para .xlsx, espia o xl/workbook.xml dentro do zip — microssegundos,
+    sem parsear o workbook inteiro. Formatos não-zip (.xls) caem para a
+    contagem via nomes de planilha.
+
+    Args:
+        file_bytes: Conteúdo do arquivo
+        filename: Nome do arquivo (parte da chave de cache)
+
+    Returns:
+        Número de planilhas
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as z:
+            return z.read('xl/workbook.xml').count(b'<sheet ')
+    except Exception:
+        return len(_get_sheet_names(file_bytes, filename))
+
+
+@st.cache_data(show_spinner=False)
+def _parse_uploaded(file_bytes: bytes, filename: str, sheet_name=0) -> Optional[pd.DataFrame]:
+    """
+    Faz o parse de um arquivo CSV/Excel em memória
+
+    Cacheado pelo conteúdo do arquivo (hash dos bytes + nome), para que
+    reruns do Streamlit não reprocessem o mesmo upload.
+
+    Args:
+        file_bytes: Conteúdo do arquivo
+        filename: Nome do arquivo
+        sheet_name: Planilha a ler (apenas Excel)
+
+    Returns:
+        DataFrame ou None
+    """
+    file_extension = filename.split('.')[-1].lower()
+
+    if file_extension == 'csv':
+        return _parse_csv(io.BytesIO(file_bytes))
+    elif file_extension in ['xlsx', 'xls']:
+        try:
+            return pd.read_excel(io.BytesIO(file_bytes), sheet_name=sheet_name,
+                                 engine='calamine')
+        except (ImportError, ValueError):
+            return pd.read_excel(io.BytesIO(file_bytes), sheet_name=sheet_name)
+
+    return None
+
+
+def _parse_csv(buffer: io.BytesIO) -> Optional[pd.DataFrame]:
+    """
+    Lê CSV detectando o separador com csv.Sniffer
+
+    O separador é detectado uma única vez nos primeiros 64 KiB em vez de
+    re-tokenizar o arquivo inteiro com cada separador candidato; só em
+    caso de falha do sniff os separadores são tentados um a um.
+
+    Args:
+        buffer: Buffer com o conteúdo do arquivo
+
+    Returns:
+        DataFrame ou None
+    """
+    head = buffer.read(65536)
+    buffer.seek(0)
+
+    try:
+        dialect = csv.Sniffer().sniff(
+            head.decode('utf-8', errors='replace'), delimiters=',;\t|'
+        )
+        df = _read_csv_with_engine(buffer, dialect.delimiter)
+        if len(df.columns) > 1:
+            return df
+    except Exception:
+        pass
+
+    # Fallback: tenta os separadores um a um (comportamento antigo)
+    for sep in [',', ';', '\t', '|']:
+        try:
+            df = _read_csv_with_engine(buffer, sep)
+            if len(df.columns) > 1:  # Sucesso se tiver mais de uma coluna
+                return df
+        except Exception:
+            continue
+
+    # Se nenhum separador funcionou, tenta com encoding diferente
+    buffer.seek(0)
+    return pd.read_csv(buffer, sep=None, engine='python', encoding='latin-1')
+
+
+def _read_csv_with_engine(buffer: io.BytesIO, sep: str) -> pd.DataFrame:
+    """
+    Lê CSV preferindo o engine pyarrow (parser multi-thread)
+
+    O pyarrow lê o arquivo inteiro em uma passada — é justamente nos
+    arquivos grandes que o parser multi-thread compensa (ler em chunks
+    e concatenar ao final não limitaria o pico de memória: os chunks e
+    o resultado coexistem). Se o pyarrow não estiver disponível ou
+    falhar, cai para o engine C com low_memory=False (uma única passada
+    de inferência de tipos).
+
+    Args:
+        buffer: Buffer com o conteúdo do arquivo
+        sep: Separador de colunas
+
+    Returns:
+        DataFrame
+    """
+    try:
+        buffer.seek(0)
+        return pd.read_csv(buffer, sep=sep, encoding='utf-8', engine='pyarrow')
+    except (ImportError, ValueError, TypeError):
+        buffer.seek(0)
+        return pd.read_csv(buffer, sep=sep, encoding='utf-8', engine='c',
+                           low_memory=False, cache_dates=True)
+
+
+@st.cache_data(show_spinner=False)
+def _parse_pdf(file_bytes: bytes) -> Optional[pd.DataFrame]:
+    """
+    Extrai a primeira tabela de um PDF
+
+    Cacheado pelo conteúdo do arquivo, como o parse de CSV/Excel: reruns
+    do Streamlit não reprocessam o mesmo PDF.
+
+    As bibliotecas de PDF (pdfplumber, tabula) são importadas aqui, no
+    primeiro upload de PDF — importá-las no topo do módulo atrasava o
+    startup da aplicação mesmo quando nenhum PDF era usado.
+
+    Args:
+        file_bytes: Conteúdo do arquivo
+
+    Returns:
+        DataFrame ou None
+    """
+    import tempfile
+
+    tmp_path = None
+    try:
+        # Tenta primeiro com pdfplumber (Python puro, sem o custo de
+        # subir a JVM do tabula a cada upload pequeno), direto do
+        # buffer em memória — sem escrever o PDF em disco
+        try:
+            import pdfplumber
+            from concurrent.futures import ThreadPoolExecutor
+
+            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+                n_pages = len(pdf.pages)
+
+            # Extrai as tabelas de cada página em paralelo. O documento
+            # pdfplumber não é thread-safe (stream e cache de objetos
+            # compartilhados), então cada worker abre sua própria visão
+            # do buffer em memória e lê só a página dele; os futures são
+            # consumidos na ordem das páginas para manter o resultado
+            # determinístico, com cancelamento do resto assim que a
+            # primeira tabela utilizável aparece
+            def _page_tables(index: int):
+                with pdfplumber.open(io.BytesIO(file_bytes)) as doc:
+                    return doc.pages[index].extract_tables()
+
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+                futures = [ex.submit(_page_tables, i) for i in range(n_pages)]
+                for i, future in enumerate(futures):
+                    for table in future.result():
+                        # Tabela utilizável: cabeçalho + dados, 2+ colunas
+                        if len(table) >= 2 and len(table[0]) >= 2:
+                            for later in futures[i + 1:]:
+                                later.cancel()
+                            return pd.DataFrame(table[1:], columns=table[0])
+        except Exception as e:
+            st.warning(f"pdfplumber falhou: {str(e)}. Tentando tabula...")
+
+        # Layouts complexos/escaneados: tenta o tabula (JVM). O arquivo
+        # temporário só é criado neste caminho de exceção
+        try:
+            import tabula
+        except ImportError:
+            st.error("⚠️ Bibliotecas de PDF não estão disponíveis. Instale pdfplumber ou tabula-py.")
+            return None
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+            tmp_file.write(file_bytes)
+            tmp_path = tmp_file.name
+
+        tables = tabula.read_pdf(tmp_path, pages='all', multiple_tables=True)
+        if tables:
+            if len(tables) > 1:
+                st.warning(f"⚠️ {len(tables)} tabelas encontradas. Usando a primeira.")
+            return tables[0]
+
+        st.error("Nenhuma tabela encontrada no PDF.")
+        return None
+
+    except Exception as e:
+        st.error(f"Erro ao ler PDF: {str(e)}")
+        return None
+    finally:
+        # Remove arquivo temporário
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@st.cache_data(show_spinner=False)
+def _preview_table(file_bytes: bytes, df_fingerprint: tuple,
+                   _df: pd.DataFrame):
+    """
+    Prepara o preview das 10 primeiras linhas para exibição
+
+    Serializa o recorte para Arrow uma única vez por upload (chave é o
+    conteúdo do arquivo + formato/colunas do frame; _df não entra no
+    hash) — reenviar um arquivo editado com o mesmo nome e tamanho
+    invalida o preview, trocar de planilha num Excel multi-aba (mesmos
+    bytes, frame diferente) também, e o st.dataframe envia Arrow nativo
+    sem reconverter o frame a cada rerun.
+
+    Args:
+        file_bytes: Conteúdo do arquivo (chave de cache)
+        df_fingerprint: Formato e colunas do frame (chave de cache)
+        _df: DataFrame carregado
+
+    Returns:
+        Tabela Arrow (ou DataFrame, sem pyarrow) com as 10 primeiras linhas
+    """
+    head = _df.head(10)
+    if _HAS_PYARROW:
+        return pa.Table.from_pandas(head, preserve_index=False)
+    return head
+
+
 def create_info_box(message: str, type: str = "info"):
     """
     Cria uma caixa de informação
@@ -83,10 +338,11 @@ class FileUploader:
             try:
                 # Determina o tipo de arquivo
                 file_extension = uploaded_file.name.split('.')[-1].lower()
-                
+
                 # Processa o arquivo baseado na extensão
+                # CSV/Excel passam pelo parse cacheado (não reprocessa em reruns)
                 if file_extension == 'csv':
-                    df = self._read_csv(uploaded_file)
+                    df = _parse_uploaded(uploaded_file.getvalue(), uploaded_file.name)
                 elif file_extension in ['xlsx', 'xls']:
                     df = self._read_excel(uploaded_file)
                 elif file_extension == 'pdf':
@@ -98,9 +354,14 @@ class FileUploader:
                 if df is not None and not df.empty:
                     create_info_box(SUCCESS_MESSAGES["FILE_LOADED"], "success")
                     
-                    # Exibe preview dos dados
+                    # Exibe preview dos dados (recorte Arrow cacheado)
                     with st.expander("👁️ Visualizar Dados", expanded=True):
-                        st.dataframe(df.head(10), use_container_width=True)
+                        preview = _preview_table(
+                            uploaded_file.getvalue(),
+                            (df.shape, tuple(map(str, df.columns))),
+                            df
+                        )
+                        st.dataframe(preview, use_container_width=True)
                         st.caption(f"Mostrando 10 de {len(df)} linhas")
                     
                     return df, uploaded_file.name
@@ -114,61 +375,31 @@ class FileUploader:
         
         return None
     
-    def _read_csv(self, file) -> Optional[pd.DataFrame]:
-        """
-        Lê arquivo CSV
-        
-        Args:
-            file: Arquivo uploaded
-        
-        Returns:
-            DataFrame ou None
-        """
-        try:
-            # Tenta diferentes separadores
-            for sep in [',', ';', '\t', '|']:
-                try:
-                    file.seek(0)
-                    df = pd.read_csv(file, sep=sep, encoding='utf-8')
-                    if len(df.columns) > 1:  # Sucesso se tiver mais de uma coluna
-                        return df
-                except:
-                    continue
-            
-            # Se nenhum separador funcionou, tenta com encoding diferente
-            file.seek(0)
-            df = pd.read_csv(file, sep=None, engine='python', encoding='latin-1')
-            return df
-            
-        except Exception as e:
-            st.error(f"Erro ao ler CSV: {str(e)}")
-            return None
-    
     def _read_excel(self, file) -> Optional[pd.DataFrame]:
         """
         Lê arquivo Excel
-        
+
         Args:
             file: Arquivo uploaded
-        
+
         Returns:
             DataFrame ou None
         """
         try:
-            # Lê a primeira planilha
-            df = pd.read_excel(file, sheet_name=0)
-            
-            # Se houver múltiplas planilhas, permite seleção
-            excel_file = pd.ExcelFile(file)
-            if len(excel_file.sheet_names) > 1:
+            file_bytes = file.getvalue()
+
+            # Se houver múltiplas planilhas, permite seleção (o
+            # selectbox fica fora da função cacheada); no caso comum de
+            # planilha única, a lista de nomes nem chega a ser lida
+            sheet_name = 0
+            if _count_sheets(file_bytes, file.name) > 1:
                 sheet_name = st.selectbox(
                     "Selecione a planilha:",
-                    excel_file.sheet_names
+                    _get_sheet_names(file_bytes, file.name)
                 )
-                df = pd.read_excel(file, sheet_name=sheet_name)
-            
-            return df
-            
+
+            return _parse_uploaded(file_bytes, file.name, sheet_name=sheet_name)
+
         except Exception as e:
             st.error(f"Erro ao ler Excel: {str(e)}")
             return None
@@ -176,51 +407,11 @@ class FileUploader:
     def _read_pdf(self, file) -> Optional[pd.DataFrame]:
         """
         Lê tabelas de arquivo PDF
-        
+
         Args:
             file: Arquivo uploaded
-        
+
         Returns:
             DataFrame ou None
         """
-        import tempfile
-        
-        try:
-            # Usa arquivo temporário do sistema
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                tmp_file.write(file.getbuffer())
-                tmp_path = tmp_file.name
-            
-            # Tenta extrair tabelas com tabula
-            try:
-                tables = tabula.read_pdf(tmp_path, pages='all', multiple_tables=True)
-                if tables:
-                    if len(tables) > 1:
-                        st.warning(f"⚠️ {len(tables)} tabelas encontradas. Usando a primeira.")
-                    df = tables[0]
-                    return df
-            except Exception as e:
-                st.warning(f"Tabula falhou: {str(e)}. Tentando pdfplumber...")
-            
-            # Se tabula falhar, tenta com pdfplumber
-            with pdfplumber.open(tmp_path) as pdf:
-                all_tables = []
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    all_tables.extend(tables)
-                
-                if all_tables:
-                    table = all_tables[0]
-                    df = pd.DataFrame(table[1:], columns=table[0])
-                    return df
-            
-            st.error("Nenhuma tabela encontrada no PDF.")
-            return None
-            
-        except Exception as e:
-            st.error(f"Erro ao ler PDF: {str(e)}")
-            return None
-        finally:
-            # Remove arquivo temporário
-            if 'tmp_path' in locals() and os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        return _parse_pdf(file.getvalue())
@@ -1,9 +1,12 @@
 """
 Calculadora avançada de confiabilidade
 """
+import math
+
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
+from scipy import stats
 from typing import Dict
 
 from config.settings import COLORS
@@ -37,6 +40,34 @@ class AdvancedCalculator:
         """
         return self.metrics.mission_reliability(mission_time, required_reliability)
     
+    def evaluate_all(self, mission_time: float, time_period: float) -> Dict:
+        """
+        Avalia as sondas do painel em uma única passada
+
+        Confiabilidade de missão, probabilidade de falha no período e
+        MTTF saem de uma avaliação vetorizada da Weibull mais o MTTF já
+        memoizado — uma chamada exp em vez de três despachos escalares
+        por movimento de slider.
+
+        Args:
+            mission_time: Tempo da missão
+            time_period: Período para a probabilidade de falha
+
+        Returns:
+            Dicionário com confiabilidade, probabilidade e MTTF
+        """
+        beta = self.results['beta']
+        eta = self.results['eta']
+
+        t = np.array([mission_time, time_period], dtype=np.float64)
+        R = np.exp(-np.power(t / eta, beta))
+
+        return {
+            'mission_reliability': float(R[0]),
+            'failure_probability': float(1.0 - R[1]),
+            'mttf': self.analysis.mean_life()
+        }
+
     def maintenance_planning(self, target_reliability: float = 0.90) -> Dict:
         """
         Planejamento de manutenção
@@ -49,10 +80,11 @@ class AdvancedCalculator:
         """
         beta = self.results['beta']
         eta = self.results['eta']
-        
-        # Calcula intervalo para atingir confiabilidade alvo
-        interval = eta * (-np.log(target_reliability)) ** (1/beta)
-        
+
+        # Calcula intervalo para atingir confiabilidade alvo — escalar
+        # puro com math, sem o dispatch numpy para um único valor
+        interval = eta * (-math.log(target_reliability)) ** (1 / beta)
+
         # Aplica fatores de segurança
         conservative_interval = interval * 0.8
         moderate_interval = interval * 0.9
@@ -84,17 +116,14 @@ class AdvancedCalculator:
         # Número esperado de falhas
         expected_failures = fleet_size * F
         
-        # Intervalo de confiança (Poisson)
-        from scipy import stats
-        lambda_param = expected_failures
-        
-        # 90% de confiança
-        lower_90 = stats.poisson.ppf(0.05, lambda_param)
-        upper_90 = stats.poisson.ppf(0.95, lambda_param)
-        
-        # 95% de confiança
-        lower_95 = stats.poisson.ppf(0.025, lambda_param)
-        upper_95 = stats.poisson.ppf(0.975, lambda_param)
+        # Intervalo de confiança (Poisson congelada): os quatro
+        # quantis (90% e 95%) saem de uma única chamada vetorizada —
+        # o ppf genérico de rv_discrete é caro por chamada, e isto
+        # roda a cada ajuste de slider
+        frozen = stats.poisson(expected_failures)
+        lower_95, lower_90, upper_90, upper_95 = frozen.ppf(
+            np.array([0.025, 0.05, 0.95, 0.975])
+        )
         
         return {
             'fleet_size': fleet_size,
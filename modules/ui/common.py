@@ -0,0 +1,25 @@
+"""
+Setup compartilhado entre o app principal e as páginas
+"""
+from utils.helpers import init_session_state
+
+# Chaves de session state usadas pelo pipeline de análise
+SESSION_DEFAULTS = {
+    "data": None,
+    "filename": None,
+    "data_status": "not_loaded",
+    "validation_results": None,
+    "processed_data": None,
+    "analysis_results": None,
+}
+
+
+def init_app_session_state():
+    """
+    Inicializa as chaves de session state do pipeline
+
+    Centraliza a lista de chaves que antes era duplicada entre app.py e
+    a página de análise principal.
+    """
+    for key, default in SESSION_DEFAULTS.items():
+        init_session_state(key, default)
@@ -10,158 +10,213 @@ import numpy as np
 from config.settings import COLORS
 
 
+# Figuras cacheadas por parâmetros: reruns do Streamlit com o mesmo
+# conjunto de análises reusam o go.Figure pronto em vez de refazer o
+# numpy e a validação de traces
+
+@st.cache_data(show_spinner=False)
+def _params_fig(labels: tuple, betas: tuple, etas: tuple) -> go.Figure:
+    """Figura de comparação de parâmetros — cacheada pelos valores"""
+    fig = go.Figure()
+
+    # Beta
+    fig.add_trace(go.Bar(
+        name='β (Beta)',
+        x=list(labels),
+        y=list(betas),
+        marker_color=COLORS['primary'],
+        texttemplate='%{y:.3f}',
+        textposition='outside'
+    ))
+
+    # Eta (em escala secundária)
+    fig.add_trace(go.Bar(
+        name='η (Eta)',
+        x=list(labels),
+        y=list(etas),
+        marker_color=COLORS['secondary'],
+        texttemplate='%{y:.1f}',
+        textposition='outside',
+        yaxis='y2'
+    ))
+
+    fig.update_layout(
+        title='<b>Comparação de Parâmetros de Weibull</b>',
+        xaxis_title='Análises',
+        yaxis=dict(title='β (Beta)', side='left'),
+        yaxis2=dict(title='η (Eta)', side='right', overlaying='y'),
+        barmode='group',
+        height=500,
+        showlegend=True
+    )
+
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _reliability_fig(labels: tuple, betas: tuple, etas: tuple,
+                     max_failure: float) -> go.Figure:
+    """Figura de comparação de confiabilidade — cacheada pelos valores"""
+    # float32 basta para exibição (o Plotly serializa para JSON de
+    # qualquer forma) e reduz pela metade os bytes do payload da grade
+    time_points = np.linspace(0, max_failure * 1.5, 200, dtype=np.float32)
+
+    fig = go.Figure()
+
+    colors = [COLORS['primary'], COLORS['secondary'], COLORS['success'],
+             COLORS['danger'], COLORS['warning'], COLORS['info']]
+
+    # Todas as curvas em uma expressão broadcasted (tempo × análise):
+    # um único pow/exp por elemento no total, em vez de uma passada
+    # numpy independente por análise
+    R_all = np.exp(-np.power(time_points[:, None] / np.asarray(etas),
+                             np.asarray(betas)))
+
+    # Traces adicionados de uma vez — add_traces valida e reindexa a
+    # lista uma única vez, em vez de uma revalidação por add_trace
+    fig.add_traces([
+        go.Scatter(
+            x=time_points,
+            y=R_all[:, i] * 100,
+            mode='lines',
+            name=label,
+            line=dict(color=colors[i % len(colors)], width=3),
+            hovertemplate='<b>%{fullData.name}</b><br>' +
+                         'Tempo: %{x:.1f}<br>' +
+                         'Confiabilidade: %{y:.2f}%<br>' +
+                         '<extra></extra>'
+        )
+        for i, label in enumerate(labels)
+    ])
+
+    fig.update_layout(
+        title='<b>Comparação de Confiabilidade</b>',
+        xaxis_title='Tempo',
+        yaxis_title='Confiabilidade R(t) (%)',
+        height=500,
+        hovermode='x unified',
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=0.98,
+            xanchor="right",
+            x=0.98
+        )
+    )
+
+    return fig
+
+
 class AnalysisComparison:
     """Classe para comparar múltiplas análises"""
-    
+
     def __init__(self):
         """Inicializa comparador"""
-        self.analyses = []
-    
+        # Layout colunar (SoA): listas paralelas no lugar de uma lista
+        # de dicts — os parâmetros viram arrays contíguos que alimentam
+        # direto o kernel broadcasted, sem lookups de dict por análise
+        self.names: List[str] = []
+        self.labels: List[str] = []
+        self.weibulls: List = []
+        self.metrics: List[Dict] = []
+        self._betas: List[float] = []
+        self._etas: List[float] = []
+        # Máximo global de tempo de falha, mantido na inserção — evita
+        # uma redução numpy por análise a cada replot
+        self._max_failure = 0.0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
     def add_analysis(self, name: str, weibull_obj, label: str = None):
         """
         Adiciona uma análise para comparação
-        
+
         Args:
             name: Nome identificador
             weibull_obj: Objeto WeibullAnalysis
             label: Label para exibição (opcional)
         """
-        self.analyses.append({
-            'name': name,
-            'label': label or name,
-            'weibull': weibull_obj,
-            'results': weibull_obj.results
-        })
-    
+        from modules.analysis.reliability_metrics import ReliabilityMetrics
+
+        self.names.append(name)
+        self.labels.append(label or name)
+        self.weibulls.append(weibull_obj)
+        # Métricas calculadas uma única vez aqui: a tabela comparativa
+        # é remontada a cada rerun do Streamlit e não precisa reavaliar
+        # gamma/quantis para os mesmos parâmetros
+        self.metrics.append(
+            ReliabilityMetrics(weibull_obj).calculate_all_metrics()
+        )
+        self._betas.append(float(weibull_obj.results['beta']))
+        self._etas.append(float(weibull_obj.results['eta']))
+        self._max_failure = max(self._max_failure,
+                                float(weibull_obj.failures.max()))
+
     def compare_parameters(self) -> go.Figure:
         """
         Compara parâmetros de Weibull
-        
+
         Returns:
             Figura Plotly
         """
-        if len(self.analyses) < 2:
+        if len(self) < 2:
             st.warning("Adicione pelo menos 2 análises para comparar")
             return None
-        
-        labels = [a['label'] for a in self.analyses]
-        betas = [a['results']['beta'] for a in self.analyses]
-        etas = [a['results']['eta'] for a in self.analyses]
-        
-        fig = go.Figure()
-        
-        # Beta
-        fig.add_trace(go.Bar(
-            name='β (Beta)',
-            x=labels,
-            y=betas,
-            marker_color=COLORS['primary'],
-            text=[f'{b:.3f}' for b in betas],
-            textposition='outside'
-        ))
-        
-        # Eta (em escala secundária)
-        fig.add_trace(go.Bar(
-            name='η (Eta)',
-            x=labels,
-            y=etas,
-            marker_color=COLORS['secondary'],
-            text=[f'{e:.1f}' for e in etas],
-            textposition='outside',
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            title='<b>Comparação de Parâmetros de Weibull</b>',
-            xaxis_title='Análises',
-            yaxis=dict(title='β (Beta)', side='left'),
-            yaxis2=dict(title='η (Eta)', side='right', overlaying='y'),
-            barmode='group',
-            height=500,
-            showlegend=True
-        )
-        
-        return fig
-    
+
+        return _params_fig(tuple(self.labels), tuple(self._betas),
+                           tuple(self._etas))
+
     def compare_reliability(self, time_points: np.ndarray = None) -> go.Figure:
         """
         Compara curvas de confiabilidade
-        
+
         Args:
             time_points: Pontos de tempo para plotar
-        
+
         Returns:
             Figura Plotly
         """
-        if len(self.analyses) < 2:
+        if len(self) < 2:
             return None
-        
-        # Define pontos de tempo se não fornecidos
-        if time_points is None:
-            max_time = max([a['weibull'].failures.max() for a in self.analyses])
-            time_points = np.linspace(0, max_time * 1.5, 200)
-        
-        fig = go.Figure()
-        
-        colors = [COLORS['primary'], COLORS['secondary'], COLORS['success'], 
-                 COLORS['danger'], COLORS['warning'], COLORS['info']]
-        
-        for i, analysis in enumerate(self.analyses):
-            R = analysis['weibull'].reliability(time_points)
-            
-            fig.add_trace(go.Scatter(
-                x=time_points,
-                y=R * 100,
-                mode='lines',
-                name=analysis['label'],
-                line=dict(color=colors[i % len(colors)], width=3),
-                hovertemplate='<b>%{fullData.name}</b><br>' +
-                             'Tempo: %{x:.1f}<br>' +
-                             'Confiabilidade: %{y:.2f}%<br>' +
-                             '<extra></extra>'
-            ))
-        
-        fig.update_layout(
-            title='<b>Comparação de Confiabilidade</b>',
-            xaxis_title='Tempo',
-            yaxis_title='Confiabilidade R(t) (%)',
-            height=500,
-            hovermode='x unified',
-            legend=dict(
-                orientation="v",
-                yanchor="top",
-                y=0.98,
-                xanchor="right",
-                x=0.98
-            )
-        )
-        
+
+        # Grade custom de tempo não entra no cache (a chave teria que
+        # carregar o array inteiro); o caminho padrão reusa a figura
+        # pronta e a grade custom reconstrói com as curvas trocadas
+        fig = _reliability_fig(tuple(self.labels), tuple(self._betas),
+                               tuple(self._etas), self._max_failure)
+        if time_points is not None:
+            fig = go.Figure(fig)
+            time_points = np.asarray(time_points, dtype=np.float64)
+            R_all = np.exp(-np.power(time_points[:, None] / np.asarray(self._etas),
+                                     np.asarray(self._betas)))
+            for i, trace in enumerate(fig.data):
+                trace.x = time_points
+                trace.y = R_all[:, i] * 100
         return fig
-    
+
     def compare_metrics_table(self) -> pd.DataFrame:
         """
         Cria tabela comparativa de métricas
-        
+
         Returns:
             DataFrame com comparação
         """
-        from modules.analysis.reliability_metrics import ReliabilityMetrics
-        
         data = []
-        
-        for analysis in self.analyses:
-            metrics_calc = ReliabilityMetrics(analysis['weibull'])
-            metrics = metrics_calc.calculate_all_metrics()
-            
+
+        for i, label in enumerate(self.labels):
+            # Métricas memoizadas em add_analysis
+            metrics = self.metrics[i]
+
             data.append({
-                'Análise': analysis['label'],
-                'β': f"{analysis['results']['beta']:.4f}",
-                'η': f"{analysis['results']['eta']:.2f}",
+                'Análise': label,
+                'β': f"{self._betas[i]:.4f}",
+                'η': f"{self._etas[i]:.2f}",
                 'MTTF': f"{metrics['mttf']:.2f}",
                 'Mediana': f"{metrics['median_life']:.2f}",
                 'B10': f"{metrics['b10_life']:.2f}",
                 'B90': f"{metrics['b90_life']:.2f}",
-                'Modo': analysis['weibull'].get_interpretation()['failure_mode']
+                'Modo': self.weibulls[i].get_interpretation()['failure_mode']
             })
-        
+
         return pd.DataFrame(data)
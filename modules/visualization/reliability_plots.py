@@ -5,9 +5,70 @@ import numpy as np
 import plotly.graph_objects as go
 from typing import Dict, List
 import pandas as pd
+import streamlit as st
 
 from config.settings import COLORS, PLOT_CONFIG
 
+# Percentis do gráfico de B-life são fixos — o termo -ln(1 - p/100) e
+# os rótulos são pré-computados no import, sobrando só a potência
+# dependente de (β, η) por chamada
+_B_LIFE_PCT = np.array([1, 5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 95, 99],
+                       dtype=np.float64)
+_B_LIFE_LOGS = -np.log1p(-_B_LIFE_PCT / 100.0)
+_B_LIFE_LABELS = [f'B{int(p)}' for p in _B_LIFE_PCT]
+
+
+# Figuras cacheadas por parâmetros (mesmo padrão do parse de arquivos):
+# reruns de widget do Streamlit reusam o go.Figure pronto em vez de
+# refazer numpy + validação de traces para os mesmos (β, η)
+
+@st.cache_data(show_spinner=False)
+def _b_life_fig(beta: float, eta: float, time_unit: str) -> go.Figure:
+    """Figura de B-life para (β, η) — cacheada por parâmetros"""
+    # Logs dos percentis fixos pré-computados no import do módulo
+    b_lives = eta * _B_LIFE_LOGS ** (1.0 / beta)
+
+    fig = go.Figure()
+
+    # Barras
+    fig.add_trace(go.Bar(
+        x=_B_LIFE_LABELS,
+        y=b_lives,
+        marker=dict(
+            color=b_lives,
+            colorscale='Viridis',
+            showscale=True,
+            colorbar=dict(title=f"Tempo<br>({time_unit})")
+        ),
+        texttemplate='%{y:.1f}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>' +
+                     f'Tempo: %{{y:.2f}} {time_unit}<br>' +
+                     '<extra></extra>'
+    ))
+
+    # Layout
+    fig.update_layout(
+        title=dict(
+            text='<b>B-Life: Tempo de Falha por Percentil</b>',
+            font=dict(size=PLOT_CONFIG["title_font_size"])
+        ),
+        xaxis=dict(
+            title='Percentil de Falha',
+            showgrid=False
+        ),
+        yaxis=dict(
+            title=f'Tempo até Falha ({time_unit})',
+            showgrid=True,
+            gridcolor='lightgray'
+        ),
+        template=PLOT_CONFIG["template"],
+        height=PLOT_CONFIG["height"],
+        showlegend=False
+    )
+
+    return fig
+
 
 class ReliabilityPlots:
     """Classe para gráficos de confiabilidade adicionais"""
@@ -28,150 +89,144 @@ class ReliabilityPlots:
     def b_life_chart(self) -> go.Figure:
         """
         Cria gráfico de B-life (B10, B50, B90, etc)
-        
+
         Returns:
             Figura Plotly
         """
-        # Percentis para calcular
-        percentiles = [1, 5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 95, 99]
-        b_lives = [self.analysis.b_life(p) for p in percentiles]
-        
-        # Cria figura
-        fig = go.Figure()
-        
-        # Barras
-        fig.add_trace(go.Bar(
-            x=[f'B{p}' for p in percentiles],
-            y=b_lives,
-            marker=dict(
-                color=b_lives,
-                colorscale='Viridis',
-                showscale=True,
-                colorbar=dict(title=f"Tempo<br>({self.time_unit})")
-            ),
-            text=[f'{b:.1f}' for b in b_lives],
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>' +
-                         f'Tempo: %{{y:.2f}} {self.time_unit}<br>' +
-                         '<extra></extra>'
-        ))
-        
-        # Layout
-        fig.update_layout(
-            title=dict(
-                text='<b>B-Life: Tempo de Falha por Percentil</b>',
-                font=dict(size=PLOT_CONFIG["title_font_size"])
-            ),
-            xaxis=dict(
-                title='Percentil de Falha',
-                showgrid=False
-            ),
-            yaxis=dict(
-                title=f'Tempo até Falha ({self.time_unit})',
-                showgrid=True,
-                gridcolor='lightgray'
-            ),
-            template=PLOT_CONFIG["template"],
-            height=PLOT_CONFIG["height"],
-            showlegend=False
-        )
-        
-        return fig
-    
+        return _b_life_fig(self.results["beta"], self.results["eta"],
+                           self.time_unit)
+
     def metrics_comparison(self) -> go.Figure:
         """
         Cria gráfico comparativo de métricas principais
-        
+
         Returns:
             Figura Plotly
         """
-        metrics = self.metrics.calculate_all_metrics()
-        
-        # Seleciona métricas principais
-        metric_names = ['MTTF', 'Mediana', 'B10', 'B90', 'Vida\nCaracterística']
-        metric_values = [
-            metrics['mttf'],
-            metrics['median_life'],
-            metrics['b10_life'],
-            metrics['b90_life'],
-            metrics['characteristic_life']
-        ]
-        
-        # Cria figura
-        fig = go.Figure()
-        
-        # Barras horizontais
-        fig.add_trace(go.Bar(
-            y=metric_names,
-            x=metric_values,
-            orientation='h',
-            marker=dict(
-                color=[COLORS["primary"], COLORS["success"], COLORS["warning"],
-                      COLORS["danger"], COLORS["info"]],
-            ),
-            text=[f'{v:.1f}' for v in metric_values],
-            textposition='outside',
-            hovertemplate='<b>%{y}</b><br>' +
-                         f'Valor: %{{x:.2f}} {self.time_unit}<br>' +
-                         '<extra></extra>'
-        ))
-        
-        # Layout
-        fig.update_layout(
-            title=dict(
-                text='<b>Comparação de Métricas de Vida</b>',
-                font=dict(size=PLOT_CONFIG["title_font_size"])
-            ),
-            xaxis=dict(
-                title=f'Tempo ({self.time_unit})',
-                showgrid=True,
-                gridcolor='lightgray'
-            ),
-            yaxis=dict(
-                showgrid=False
-            ),
-            template=PLOT_CONFIG["template"],
-            height=400,
-            showlegend=False
-        )
-        
-        return fig
-    
-    def failure_distribution_histogram(self) -> go.Figure:
+        return _metrics_fig((self.results["beta"], self.results["eta"]),
+                            self.metrics, self.time_unit)
+
+    def failure_distribution_histogram(self,
+                                       show_theoretical: bool = True) -> go.Figure:
         """
         Cria histograma dos tempos de falha
-        
+
+        Args:
+            show_theoretical: Se deve sobrepor a curva PDF teórica —
+                desligar evita a avaliação da PDF no servidor
+
         Returns:
             Figura Plotly
         """
+        # Hash do conteúdo na chave: dois datasets que coincidem em
+        # (β, η, n) não podem servir o histograma um do outro
         failures = self.analysis.failures
-        
-        # Cria figura
-        fig = go.Figure()
-        
-        # Histograma
-        fig.add_trace(go.Histogram(
-            x=failures,
-            nbinsx=20,
-            name='Falhas Observadas',
-            marker=dict(
-                color=COLORS["primary"],
-                line=dict(color='white', width=1)
-            ),
-            opacity=0.7,
-            hovertemplate='<b>Intervalo:</b> %{x}<br>' +
-                         '<b>Frequência:</b> %{y}<br>' +
-                         '<extra></extra>'
-        ))
-        
-        # Curva PDF teórica sobreposta
-        t = np.linspace(failures.min(), failures.max(), 100)
-        pdf = self.analysis.pdf(t)
-        
-        # Escala PDF para combinar com histograma
-        hist_counts, _ = np.histogram(failures, bins=20)
-        scale_factor = max(hist_counts) / max(pdf) if max(pdf) > 0 else 1
-        
+        return _hist_fig(
+            (self.results["beta"], self.results["eta"],
+             hash(failures.tobytes())),
+            self.analysis, self.time_unit, show_theoretical
+        )
+
+
+@st.cache_data(show_spinner=False)
+def _metrics_fig(cache_key: tuple, _metrics_calc, time_unit: str) -> go.Figure:
+    """Figura comparativa de métricas — cacheada por (β, η)"""
+    metrics = _metrics_calc.calculate_all_metrics()
+
+    # Seleciona métricas principais
+    metric_names = ['MTTF', 'Mediana', 'B10', 'B90', 'Vida\nCaracterística']
+    metric_values = [
+        metrics['mttf'],
+        metrics['median_life'],
+        metrics['b10_life'],
+        metrics['b90_life'],
+        metrics['characteristic_life']
+    ]
+
+    # Cria figura
+    fig = go.Figure()
+
+    # Barras horizontais
+    fig.add_trace(go.Bar(
+        y=metric_names,
+        x=metric_values,
+        orientation='h',
+        marker=dict(
+            color=[COLORS["primary"], COLORS["success"], COLORS["warning"],
+                  COLORS["danger"], COLORS["info"]],
+        ),
+        texttemplate='%{x:.1f}',
+        textposition='outside',
+        hovertemplate='<b>%{y}</b><br>' +
+                     f'Valor: %{{x:.2f}} {time_unit}<br>' +
+                     '<extra></extra>'
+    ))
+
+    # Layout
+    fig.update_layout(
+        title=dict(
+            text='<b>Comparação de Métricas de Vida</b>',
+            font=dict(size=PLOT_CONFIG["title_font_size"])
+        ),
+        xaxis=dict(
+            title=f'Tempo ({time_unit})',
+            showgrid=True,
+            gridcolor='lightgray'
+        ),
+        yaxis=dict(
+            showgrid=False
+        ),
+        template=PLOT_CONFIG["template"],
+        height=400,
+        showlegend=False
+    )
+
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _hist_fig(cache_key: tuple, _analysis, time_unit: str,
+              show_theoretical: bool = True) -> go.Figure:
+    """Histograma de falhas + PDF — cacheado por (β, η, hash dos dados)"""
+    failures = _analysis.failures
+
+    # Cria figura
+    fig = go.Figure()
+
+    # Histograma binado uma única vez no servidor — o mesmo
+    # np.histogram alimenta as barras e o fator de escala da PDF
+    # (antes o Plotly rebinava no cliente e o np.histogram rodava
+    # de novo só para a escala), com bins determinísticos
+    counts, edges = np.histogram(failures, bins=20)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+
+    fig.add_trace(go.Bar(
+        x=centers,
+        y=counts,
+        width=np.diff(edges),
+        name='Falhas Observadas',
+        marker=dict(
+            color=COLORS["primary"],
+            line=dict(color='white', width=1)
+        ),
+        opacity=0.7,
+        hovertemplate='<b>Intervalo:</b> %{x}<br>' +
+                     '<b>Frequência:</b> %{y}<br>' +
+                     '<extra></extra>'
+    ))
+
+    if show_theoretical:
+        # Curva PDF teórica sobreposta — grade em float32, suficiente
+        # para exibição e metade do payload serializado
+        t = np.linspace(failures.min(), failures.max(), 100,
+                        dtype=np.float32)
+        pdf = _analysis.pdf(t)
+
+        # Escala PDF para combinar com histograma — cada máximo é
+        # reduzido uma única vez
+        pdf_max = pdf.max()
+        scale_factor = counts.max() / pdf_max if pdf_max > 0 else 1.0
+
         fig.add_trace(go.Scatter(
             x=t,
             y=pdf * scale_factor,
@@ -185,34 +240,34 @@ class ReliabilityPlots:
                          '<b>Densidade (escala):</b> %{y:.2f}<br>' +
                          '<extra></extra>'
         ))
-        
-        # Layout
-        fig.update_layout(
-            title=dict(
-                text='<b>Distribuição dos Tempos de Falha</b>',
-                font=dict(size=PLOT_CONFIG["title_font_size"])
-            ),
-            xaxis=dict(
-                title=f'Tempo até Falha ({self.time_unit})',
-                showgrid=True,
-                gridcolor='lightgray'
-            ),
-            yaxis=dict(
-                title='Frequência',
-                showgrid=True,
-                gridcolor='lightgray'
-            ),
-            template=PLOT_CONFIG["template"],
-            height=PLOT_CONFIG["height"],
-            barmode='overlay',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+
+    # Layout
+    fig.update_layout(
+        title=dict(
+            text='<b>Distribuição dos Tempos de Falha</b>',
+            font=dict(size=PLOT_CONFIG["title_font_size"])
+        ),
+        xaxis=dict(
+            title=f'Tempo até Falha ({time_unit})',
+            showgrid=True,
+            gridcolor='lightgray'
+        ),
+        yaxis=dict(
+            title='Frequência',
+            showgrid=True,
+            gridcolor='lightgray'
+        ),
+        template=PLOT_CONFIG["template"],
+        height=PLOT_CONFIG["height"],
+        barmode='overlay',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
         )
-        
-        return fig
+    )
+
+    return fig
 
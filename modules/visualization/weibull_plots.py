@@ -9,6 +9,56 @@ import streamlit as st
 
 from config.settings import COLORS, PLOT_CONFIG
 
+# Acima deste número de pontos observados, os scatters são reduzidos
+# com LTTB antes de ir ao browser — o gargalo em frotas grandes é o
+# payload e o render do plotly.js, não o cálculo no servidor
+_LTTB_THRESHOLD = 2000
+
+
+def _lttb(x: np.ndarray, y: np.ndarray,
+          n_out: int = _LTTB_THRESHOLD) -> tuple:
+    """
+    Reduz uma série para n_out pontos com Largest-Triangle-Three-Buckets
+
+    Mantém o ponto de maior triângulo por balde, preservando a forma
+    visual da curva (picos e degraus) com uma fração dos pontos.
+
+    Args:
+        x: Abscissas ordenadas
+        y: Ordenadas correspondentes
+        n_out: Número de pontos de saída
+
+    Returns:
+        Tupla (x_reduzido, y_reduzido)
+    """
+    n = x.size
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0] = 0
+    idx[-1] = n - 1
+    every = (n - 2) / (n_out - 2)
+
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+
+        # Média do balde seguinte como terceiro vértice do triângulo
+        avg_x = x[end:avg_end].mean() if avg_end > end else x[-1]
+        avg_y = y[end:avg_end].mean() if avg_end > end else y[-1]
+
+        xs = x[start:end]
+        ys = y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a])
+                      - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return x[idx], y[idx]
+
 
 class WeibullPlots:
     """Classe para criar gráficos de Weibull"""
@@ -25,7 +75,19 @@ class WeibullPlots:
         self.metrics = metrics_calculator
         self.results = weibull_analysis.results
         self.time_unit = self.results["time_unit"]
-    
+
+        # Hovertemplates com a unidade de tempo montados uma única vez —
+        # os métodos de plot reusam as strings prontas a cada rerun
+        _prefix = f'<b>Tempo:</b> %{{x:.2f}} {self.time_unit}<br>'
+        self._ht_points = (_prefix +
+                           '<b>Probabilidade:</b> %{y:.2f}%<br><extra></extra>')
+        self._ht_theory = (_prefix +
+                           '<b>Probabilidade Teórica:</b> %{y:.2f}%<br><extra></extra>')
+        self._ht_reliability = (_prefix +
+                                '<b>Confiabilidade:</b> %{y:.2f}%<br><extra></extra>')
+        self._ht_hazard = (_prefix +
+                           '<b>Taxa de Falha:</b> %{y:.4f}<br><extra></extra>')
+
     def probability_plot(self) -> go.Figure:
         """
         Cria gráfico de probabilidade de Weibull
@@ -33,74 +95,80 @@ class WeibullPlots:
         Returns:
             Figura Plotly
         """
-        # Dados observados
-        sorted_failures = np.sort(self.analysis.failures)
-        n = len(sorted_failures)
-        
-        # Median ranks
-        ranks = np.arange(1, n + 1)
-        median_ranks = (ranks - 0.3) / (n + 0.4)
-        
-        # Linha teórica de Weibull
-        t_theory = np.linspace(sorted_failures.min() * 0.5, 
-                              sorted_failures.max() * 1.2, 100)
+        # Dados observados e median ranks dos buffers compartilhados;
+        # frotas grandes são reduzidas com LTTB antes do plot
+        sorted_failures = self.analysis._sorted_failures
+        median_ranks, _ = self.analysis._plotting_positions()
+        sorted_failures, median_ranks = _lttb(sorted_failures, median_ranks)
+
+        # Linha teórica de Weibull — amostragem geométrica: o eixo x é
+        # log, então 60 pontos equiespaçados em log cobrem a mesma
+        # densidade visual que 100 lineares (que se acumulavam no fim)
+        t_theory = np.geomspace(sorted_failures[0] * 0.5,
+                                sorted_failures[-1] * 1.2, 60)
         F_theory = self.analysis.unreliability(t_theory)
         
-        # Cria figura
-        fig = go.Figure()
-        
-        # Pontos observados
-        fig.add_trace(go.Scatter(
-            x=sorted_failures,
-            y=median_ranks * 100,
-            mode='markers',
-            name='Dados Observados',
-            marker=dict(
-                size=8,
-                color=COLORS["primary"],
-                symbol='circle',
-                line=dict(width=1, color='white')
+        # Intervalos de confiança: os dois limites em um broadcast
+        # (exp(logr·β) no lugar de dois ** independentes) e o polígono
+        # da banda preenchido em um buffer pré-alocado, sem os quatro
+        # temporários de concatenate
+        beta_ci = np.array(self.results["beta_ci"], dtype=np.float64)
+        eta = self.results["eta"]
+
+        n = t_theory.size
+        logr = np.log(t_theory / eta)
+        F_band = 1 - np.exp(-np.exp(logr * beta_ci[:, None]))
+
+        band_x = np.empty(2 * n)
+        band_x[:n] = t_theory
+        band_x[n:] = t_theory[::-1]
+        band_y = np.empty(2 * n)
+        band_y[:n] = F_band[0] * 100
+        band_y[n:] = F_band[1, ::-1] * 100
+
+        # Cria a figura com os traces de uma vez (arrays numpy direto,
+        # sem conversões intermediárias para listas Python)
+        fig = go.Figure(data=[
+            # Pontos observados
+            go.Scattergl(
+                x=sorted_failures,
+                y=median_ranks * 100,
+                mode='markers',
+                name='Dados Observados',
+                marker=dict(
+                    size=8,
+                    color=COLORS["primary"],
+                    symbol='circle',
+                    line=dict(width=1, color='white')
+                ),
+                hovertemplate=self._ht_points
             ),
-            hovertemplate='<b>Tempo:</b> %{x:.2f} ' + self.time_unit + '<br>' +
-                         '<b>Probabilidade:</b> %{y:.2f}%<br>' +
-                         '<extra></extra>'
-        ))
-        
-        # Linha teórica
-        fig.add_trace(go.Scatter(
-            x=t_theory,
-            y=F_theory * 100,
-            mode='lines',
-            name='Ajuste Weibull',
-            line=dict(
-                color=COLORS["danger"],
-                width=2,
-                dash='solid'
+            # Linha teórica
+            go.Scattergl(
+                x=t_theory,
+                y=F_theory * 100,
+                mode='lines',
+                name='Ajuste Weibull',
+                line=dict(
+                    color=COLORS["danger"],
+                    width=2,
+                    dash='solid'
+                ),
+                hovertemplate=self._ht_theory
             ),
-            hovertemplate='<b>Tempo:</b> %{x:.2f} ' + self.time_unit + '<br>' +
-                         '<b>Probabilidade Teórica:</b> %{y:.2f}%<br>' +
-                         '<extra></extra>'
-        ))
-        
-        # Intervalos de confiança
-        beta_lower = self.results["beta_ci"][0]
-        beta_upper = self.results["beta_ci"][1]
-        eta = self.results["eta"]
-        
-        F_lower = 1 - np.exp(-(t_theory / eta) ** beta_lower)
-        F_upper = 1 - np.exp(-(t_theory / eta) ** beta_upper)
-        
-        fig.add_trace(go.Scatter(
-            x=np.concatenate([t_theory, t_theory[::-1]]),
-            y=np.concatenate([F_lower * 100, F_upper[::-1] * 100]),
-            fill='toself',
-            fillcolor='rgba(31, 119, 180, 0.2)',
-            line=dict(color='rgba(255,255,255,0)'),
-            name=f'IC {self.results["confidence_level"]*100:.0f}%',
-            showlegend=True,
-            hoverinfo='skip'
-        ))
-        
+            # Banda do intervalo de confiança
+            go.Scatter(
+                x=band_x,
+                y=band_y,
+                fill='toself',
+                fillcolor='rgba(31, 119, 180, 0.2)',
+                line=dict(color='rgba(255,255,255,0)'),
+                name=f'IC {self.results["confidence_level"]*100:.0f}%',
+                showlegend=True,
+                hoverinfo='skip'
+            ),
+        ])
+
         # Layout
         fig.update_layout(
             title=dict(
@@ -139,18 +207,17 @@ class WeibullPlots:
         Returns:
             Figura Plotly
         """
-        # Gera pontos de tempo
-        t_max = max(self.analysis.failures) * 1.5
-        t = np.linspace(0, t_max, 200)
-        
-        # Calcula confiabilidade
-        R = self.analysis.reliability(t)
+        # Usa a grade pré-computada no objeto de análise
+        grid = self.analysis.evaluation_grid()
+        t = grid["t"]
+        t_max = t[-1]
+        R = grid["R"]
         
         # Cria figura
         fig = go.Figure()
         
         # Curva de confiabilidade
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=t,
             y=R * 100,
             mode='lines',
@@ -161,15 +228,13 @@ class WeibullPlots:
             ),
             fill='tozeroy',
             fillcolor='rgba(44, 160, 44, 0.2)',
-            hovertemplate='<b>Tempo:</b> %{x:.2f} ' + self.time_unit + '<br>' +
-                         '<b>Confiabilidade:</b> %{y:.2f}%<br>' +
-                         '<extra></extra>'
+            hovertemplate=self._ht_reliability
         ))
         
-        # Adiciona linhas de referência
-        for reliability_level in [90, 50, 10]:
-            time_at_level = self.analysis.b_life(100 - reliability_level)
-            
+        # Adiciona linhas de referência — os três tempos saem de uma
+        # única chamada vetorizada em vez de três resoluções escalares
+        ref_times = self.analysis.b_life_batch([10, 50, 90])
+        for reliability_level, time_at_level in zip([90, 50, 10], ref_times):
             if time_at_level <= t_max:
                 fig.add_hline(
                     y=reliability_level,
@@ -220,18 +285,17 @@ class WeibullPlots:
         Returns:
             Figura Plotly
         """
-        # Gera pontos de tempo
-        t_max = max(self.analysis.failures) * 1.5
-        t = np.linspace(0.01, t_max, 200)
-        
-        # Calcula taxa de falha
-        h = self.analysis.hazard_rate(t)
+        # Usa a grade pré-computada no objeto de análise
+        grid = self.analysis.evaluation_grid()
+        t = grid["t"]
+        t_max = t[-1]
+        h = grid["h"]
         
         # Cria figura
         fig = go.Figure()
         
         # Curva de taxa de falha
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=t,
             y=h,
             mode='lines',
@@ -242,9 +306,7 @@ class WeibullPlots:
             ),
             fill='tozeroy',
             fillcolor='rgba(214, 39, 40, 0.2)',
-            hovertemplate='<b>Tempo:</b> %{x:.2f} ' + self.time_unit + '<br>' +
-                         '<b>Taxa de Falha:</b> %{y:.4f}<br>' +
-                         '<extra></extra>'
+            hovertemplate=self._ht_hazard
         ))
         
         # Determina comportamento
@@ -302,13 +364,11 @@ class WeibullPlots:
         Returns:
             Figura Plotly com subplots
         """
-        # Gera pontos de tempo
-        t_max = max(self.analysis.failures) * 1.5
-        t = np.linspace(0.01, t_max, 200)
-        
-        # Calcula PDF e CDF
-        pdf = self.analysis.pdf(t)
-        cdf = self.analysis.unreliability(t)
+        # Usa a grade pré-computada no objeto de análise
+        grid = self.analysis.evaluation_grid()
+        t = grid["t"]
+        pdf = grid["f"]
+        cdf = grid["F"]
         
         # Cria subplots
         fig = make_subplots(
@@ -319,7 +379,7 @@ class WeibullPlots:
         
         # PDF
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=t,
                 y=pdf,
                 mode='lines',
@@ -336,7 +396,7 @@ class WeibullPlots:
         
         # CDF
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=t,
                 y=cdf * 100,
                 mode='lines',
@@ -356,7 +416,7 @@ class WeibullPlots:
         if metrics["mode"] > 0:
             mode_pdf = self.analysis.pdf(np.array([metrics["mode"]]))[0]
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=[metrics["mode"]],
                     y=[mode_pdf],
                     mode='markers',
@@ -395,10 +455,10 @@ class WeibullPlots:
         Returns:
             Figura Plotly com subplots
         """
-        # Gera pontos de tempo
-        t_max = max(self.analysis.failures) * 1.5
-        t = np.linspace(0.01, t_max, 200)
-        
+        # Usa a grade pré-computada no objeto de análise
+        grid = self.analysis.evaluation_grid()
+        t = grid["t"]
+
         # Cria subplots 2x2
         fig = make_subplots(
             rows=2, cols=2,
@@ -413,50 +473,50 @@ class WeibullPlots:
         )
         
         # 1. Confiabilidade
-        R = self.analysis.reliability(t)
+        R = grid["R"]
         fig.add_trace(
-            go.Scatter(x=t, y=R*100, name='R(t)', 
+            go.Scattergl(x=t, y=R*100, name='R(t)', 
                       line=dict(color=COLORS["success"], width=2),
                       showlegend=False),
             row=1, col=1
         )
         
         # 2. Taxa de Falha
-        h = self.analysis.hazard_rate(t)
+        h = grid["h"]
         fig.add_trace(
-            go.Scatter(x=t, y=h, name='h(t)',
+            go.Scattergl(x=t, y=h, name='h(t)',
                       line=dict(color=COLORS["danger"], width=2),
                       showlegend=False),
             row=1, col=2
         )
         
         # 3. PDF
-        pdf = self.analysis.pdf(t)
+        pdf = grid["f"]
         fig.add_trace(
-            go.Scatter(x=t, y=pdf, name='f(t)',
+            go.Scattergl(x=t, y=pdf, name='f(t)',
                       line=dict(color=COLORS["primary"], width=2),
                       fill='tozeroy',
                       showlegend=False),
             row=2, col=1
         )
         
-        # 4. Dados vs Ajuste
-        sorted_failures = np.sort(self.analysis.failures)
-        n = len(sorted_failures)
-        ranks = np.arange(1, n + 1)
-        median_ranks = (ranks - 0.3) / (n + 0.4)
-        
+        # 4. Dados vs Ajuste — buffers compartilhados da análise,
+        # reduzidos com LTTB para frotas grandes
+        sorted_failures = self.analysis._sorted_failures
+        median_ranks, _ = self.analysis._plotting_positions()
+        sorted_failures, median_ranks = _lttb(sorted_failures, median_ranks)
+
         fig.add_trace(
-            go.Scatter(x=sorted_failures, y=median_ranks*100,
+            go.Scattergl(x=sorted_failures, y=median_ranks*100,
                       mode='markers', name='Dados',
                       marker=dict(color=COLORS["primary"], size=6),
                       showlegend=False),
             row=2, col=2
         )
         
-        F_theory = self.analysis.unreliability(t)
+        F_theory = grid["F"]
         fig.add_trace(
-            go.Scatter(x=t, y=F_theory*100, name='Ajuste',
+            go.Scattergl(x=t, y=F_theory*100, name='Ajuste',
                       line=dict(color=COLORS["danger"], width=2),
                       showlegend=False),
             row=2, col=2
@@ -13,12 +13,14 @@ from config.settings import APP_CONFIG, TOOLTIPS
 from modules.data_handler.file_uploader import FileUploader
 from modules.data_handler.data_validator import DataValidator
 from modules.data_handler.data_processor import DataProcessor
+from modules.analysis.results import AnalysisResults
 from modules.analysis.weibull_analysis import WeibullAnalysis
 from modules.analysis.reliability_metrics import ReliabilityMetrics
 from modules.analysis.statistical_tests import StatisticalTests
 from modules.visualization.weibull_plots import WeibullPlots
 from modules.visualization.reliability_plots import ReliabilityPlots
-from utils.helpers import init_session_state, format_number
+from modules.ui.common import init_app_session_state
+from utils.helpers import format_number
 from utils.constants import TIME_UNITS
 
 # Configuração da página
@@ -29,12 +31,7 @@ st.set_page_config(
 )
 
 # Inicialização do session state
-init_session_state("data", None)
-init_session_state("filename", None)
-init_session_state("data_status", "not_loaded")
-init_session_state("validation_results", None)
-init_session_state("processed_data", None)
-init_session_state("analysis_results", None)
+init_app_session_state()
 
 # Título
 st.title("📊 Análise Principal")
@@ -149,7 +146,19 @@ if st.session_state.get("processed_data") is not None:
             step=0.01,
             format="%.2f"
         )
-    
+
+    # Ajuste por equipamento: só oferecido quando os dados têm a coluna
+    # de identificação com mais de um grupo
+    fit_per_group = False
+    if ("equipamento" in st.session_state["processed_data"].columns
+            and st.session_state["processed_data"]["equipamento"].nunique() > 1):
+        fit_per_group = st.checkbox(
+            "Ajustar por equipamento",
+            value=False,
+            help="Ajusta uma Weibull independente para cada equipamento "
+                 "(os ajustes rodam em paralelo)"
+        )
+
     if st.button("📈 Executar Análise de Weibull", type="primary"):
         with st.spinner("Executando análise..."):
             weibull = WeibullAnalysis(st.session_state["processed_data"])
@@ -160,14 +169,14 @@ if st.session_state.get("processed_data") is not None:
             test_results = tests.run_all_tests()
             interpretation = weibull.get_interpretation()
             
-            st.session_state["analysis_results"] = {
-                "weibull": results,
-                "metrics": metrics,
-                "tests": test_results,
-                "interpretation": interpretation,
-                "weibull_obj": weibull,
-                "metrics_obj": metrics_calc
-            }
+            st.session_state["analysis_results"] = AnalysisResults(
+                weibull=results,
+                metrics=metrics,
+                tests=test_results,
+                interpretation=interpretation,
+                weibull_obj=weibull,
+                metrics_obj=metrics_calc
+            )
             st.session_state["data_status"] = "analyzed"
             st.success("✅ Análise concluída!")
             
@@ -216,14 +225,39 @@ if st.session_state.get("processed_data") is not None:
             r2_result = test_results["r_squared"]
             st.metric("R²", f"{r2_result['r_squared']:.4f}", delta=r2_result['quality'])
 
+            # Ajuste por equipamento (opcional)
+            if fit_per_group:
+                import pandas as pd
+
+                st.markdown("---")
+                st.subheader("🏭 Ajuste por Equipamento")
+
+                by_group = WeibullAnalysis.fit_by_group(
+                    st.session_state["processed_data"], method=method
+                )
+                if by_group:
+                    st.dataframe(pd.DataFrame([
+                        {
+                            'Equipamento': name,
+                            'β': f"{a.results['beta']:.4f}",
+                            'η': f"{a.results['eta']:.2f}",
+                            'Falhas': len(a.failures),
+                            'MTTF': f"{a.mean_life():.2f}",
+                        }
+                        for name, a in by_group.items()
+                    ]), use_container_width=True)
+                else:
+                    st.info("ℹ️ Nenhum equipamento possui falhas suficientes "
+                            "para um ajuste individual.")
+
 # ETAPA 5: Visualizações
 if st.session_state.get("analysis_results") is not None:
     st.markdown("---")
     st.header("5️⃣ Visualizações")
     
     analysis_results = st.session_state["analysis_results"]
-    weibull_obj = analysis_results["weibull_obj"]
-    metrics_obj = analysis_results["metrics_obj"]
+    weibull_obj = analysis_results.weibull_obj
+    metrics_obj = analysis_results.metrics_obj
     
     weibull_plots = WeibullPlots(weibull_obj, metrics_obj)
     reliability_plots = ReliabilityPlots(weibull_obj, metrics_obj)
@@ -265,9 +299,9 @@ if st.session_state.get("analysis_results") is not None:
         col1, col2 = st.columns(2)
         with col1:
             calc_time = st.number_input(
-                f"Tempo ({analysis_results['weibull']['time_unit']})",
+                f"Tempo ({analysis_results.weibull['time_unit']})",
                 min_value=0.0,
-                value=float(analysis_results['metrics']['median_life']),
+                value=float(analysis_results.metrics['median_life']),
                 step=10.0
             )
         with col2:
@@ -290,8 +324,8 @@ if st.session_state.get("analysis_results") is not None:
     from modules.ui.advanced_calculator import AdvancedCalculator
     
     analysis_results = st.session_state["analysis_results"]
-    weibull_obj = analysis_results["weibull_obj"]
-    metrics_obj = analysis_results["metrics_obj"]
+    weibull_obj = analysis_results.weibull_obj
+    metrics_obj = analysis_results.metrics_obj
     
     tab1, tab2, tab3 = st.tabs([
         "📄 Relatórios",
@@ -311,9 +345,9 @@ if st.session_state.get("analysis_results") is not None:
         
         with col1:
             mission_time = st.number_input(
-                f"Tempo da Missão ({analysis_results['weibull']['time_unit']})",
+                f"Tempo da Missão ({analysis_results.weibull['time_unit']})",
                 min_value=0.0,
-                value=float(analysis_results['metrics']['median_life']),
+                value=float(analysis_results.metrics['median_life']),
                 step=100.0
             )
         
@@ -404,9 +438,9 @@ if st.session_state.get("analysis_results") is not None:
         
         with col2:
             time_period = st.number_input(
-                f"Período de Análise ({analysis_results['weibull']['time_unit']})",
+                f"Período de Análise ({analysis_results.weibull['time_unit']})",
                 min_value=100.0,
-                value=float(analysis_results['metrics']['mttf']),
+                value=float(analysis_results.metrics['mttf']),
                 step=100.0
             )
         
@@ -434,7 +468,36 @@ if st.session_state.get("analysis_results") is not None:
                     spare_result['recommended_spares_95'],
                     help=f"Entre {spare_result['confidence_95'][0]} e {spare_result['confidence_95'][1]}"
                 )
-    
+
+        st.markdown("---")
+        st.subheader("⚡ Resumo Instantâneo")
+
+        # Atualiza a cada movimento de slider: um único despacho
+        # vetorizado (evaluate_all) no lugar de três sondas escalares
+        summary = calculator.evaluate_all(mission_time, time_period)
+
+        col_a, col_b, col_c = st.columns(3)
+
+        with col_a:
+            st.metric(
+                "Confiabilidade na Missão",
+                f"{summary['mission_reliability']*100:.2f}%",
+                help="R(t) no tempo da missão informado acima"
+            )
+
+        with col_b:
+            st.metric(
+                "Prob. de Falha no Período",
+                f"{summary['failure_probability']*100:.2f}%",
+                help="F(t) no período de análise informado acima"
+            )
+
+        with col_c:
+            st.metric(
+                "MTTF",
+                format_number(summary['mttf'], 2, analysis_results.weibull['time_unit'])
+            )
+
     with tab3:
         st.subheader("💰 Análise Custo-Benefício")
         
@@ -503,9 +566,9 @@ if st.session_state.get("analysis_results") is not None:
                 )
             
             st.info(f"""
-            **Intervalo de Manutenção Preventiva Recomendado:** {cost_result['pm_interval']:.0f} {analysis_results['weibull']['time_unit']}
+            **Intervalo de Manutenção Preventiva Recomendado:** {cost_result['pm_interval']:.0f} {analysis_results.weibull['time_unit']}
             
-            **MTTF:** {cost_result['mttf']:.0f} {analysis_results['weibull']['time_unit']}
+            **MTTF:** {cost_result['mttf']:.0f} {analysis_results.weibull['time_unit']}
             
             Com manutenção preventiva, você economiza **${cost_result['savings_per_hour']:.2f} por hora** de operação!
             """)
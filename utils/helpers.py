@@ -140,6 +140,25 @@ def init_session_state(key: str, default_value: Any):
         st.session_state[key] = default_value
 
 
+def get_or_build(key: str, builder):
+    """
+    Retorna um valor do session state, construindo-o apenas uma vez
+
+    Evita reconstruir objetos caros (ex: figuras Plotly) a cada rerun
+    do Streamlit causado por interação com widgets.
+
+    Args:
+        key: Chave no session state
+        builder: Função sem argumentos que constrói o valor
+
+    Returns:
+        Valor armazenado (ou recém-construído)
+    """
+    if key not in st.session_state:
+        st.session_state[key] = builder()
+    return st.session_state[key]
+
+
 def clear_session_state(keys: Optional[List[str]] = None):
     """
     Limpa variáveis do session state
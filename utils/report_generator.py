@@ -4,7 +4,6 @@ Módulo para geração de relatórios com gráficos
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from typing import Dict, Optional
 import io
 import base64
 import plotly.graph_objects as go
@@ -17,22 +16,22 @@ from config.settings import COLORS
 class ReportGenerator:
     """Classe para gerar relatórios de análise com gráficos"""
     
-    def __init__(self, analysis_results: Dict, filename: str):
+    def __init__(self, analysis_results, filename: str):
         """
         Inicializa o gerador de relatórios
-        
+
         Args:
-            analysis_results: Resultados da análise completa
+            analysis_results: AnalysisResults da análise completa
             filename: Nome do arquivo original
         """
         self.results = analysis_results
         self.filename = filename
-        self.weibull = analysis_results['weibull']
-        self.metrics = analysis_results['metrics']
-        self.tests = analysis_results['tests']
-        self.interpretation = analysis_results['interpretation']
-        self.weibull_obj = analysis_results['weibull_obj']
-        self.metrics_obj = analysis_results['metrics_obj']
+        self.weibull = analysis_results.weibull
+        self.metrics = analysis_results.metrics
+        self.tests = analysis_results.tests
+        self.interpretation = analysis_results.interpretation
+        self.weibull_obj = analysis_results.weibull_obj
+        self.metrics_obj = analysis_results.metrics_obj
     
     def _create_probability_plot_html(self) -> str:
         """Cria gráfico de probabilidade em HTML"""
@@ -696,12 +695,12 @@ class ReportGenerator:
         return pd.DataFrame(summary_data)
 
 
-def display_report_section(analysis_results: Dict, filename: str):
+def display_report_section(analysis_results, filename: str):
     """
     Exibe seção de relatórios no Streamlit
-    
+
     Args:
-        analysis_results: Resultados da análise
+        analysis_results: AnalysisResults da análise
         filename: Nome do arquivo
     """
     st.subheader("📄 Exportar Relatório")